@@ -65,3 +65,29 @@ class InternApplicationParameters(str, Enum):
     education = "education"
     citizenship = "citizenship"
     graduation_date = "graduation_date"
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class EntityName(str, Enum):
+    """
+    Сущности с версией изменений (таблица entity_versions), используется для ETag
+    """
+
+    vacancies = "vacancies"
+    events = "events"
+
+
+class CachedEntity(str, Enum):
+    """
+    Сущности, об изменении которых воркеры оповещают друг друга (LISTEN/NOTIFY)
+    для сброса кэшей в памяти
+    """
+
+    vacancies = "vacancies"
+    events = "events"
+    users = "users"
+    intern_applications = "intern_applications"
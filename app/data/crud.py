@@ -1,15 +1,48 @@
-from sqlalchemy import func, text, desc, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import func, text, desc, or_, select, insert, literal
+from sqlalchemy.engine import MappingResult
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.utils.logging import log
 from app.utils.list import flatten
+from app.utils import score_digest
+from app.utils.fio import FioIndex
+from app.utils.metrics import time_module_functions
+from app.utils.settings import settings
 from app.data.constants import (
     UserRole,
     MentorStatus,
     InternApplicationStatus,
     InternApplicationParameters,
+    EntityName,
+    CachedEntity,
 )
 
-from . import models, schemas
+from . import invalidation, models, schemas
+
+
+# region EntityVersion
+def get_entity_version(db: Session, name: EntityName) -> int:
+    version = (
+        db.query(models.EntityVersion.version)
+        .filter(models.EntityVersion.name == name.value)
+        .scalar()
+    )
+    return version or 0
+
+
+def bump_entity_version(db: Session, name: EntityName) -> None:
+    # increment inside the caller's transaction, visible to readers after commit
+    db_query = pg_insert(models.EntityVersion).values(name=name.value, version=1)
+    db.execute(
+        db_query.on_conflict_do_update(
+            index_elements=[models.EntityVersion.name],
+            set_={"version": models.EntityVersion.version + 1},
+        )
+    )
+    invalidation.publish(db, CachedEntity(name.value))
+
+
+# endregion EntityVersion
 
 
 # region User
@@ -49,12 +82,68 @@ def update_user(db: Session, user: schemas.User) -> models.User:
     db_user.telegram = user.telegram if user.telegram else db_user.telegram
 
     db_user = db.merge(db_user)
+    invalidation.publish(db, CachedEntity.users, db_user.id)
     db.commit()
     db.refresh(db_user)
 
     return db_user
 
 
+def get_existing_emails(db: Session, emails: list[str]) -> set[str]:
+    return set(
+        db.scalars(select(models.User.email).where(models.User.email.in_(emails)))
+    )
+
+
+def create_users_bulk(
+    db: Session,
+    users: list[schemas.UserCreateHashed],
+    sender: models.User,
+    subject: str,
+    batch_size: int = 1000,
+) -> list[tuple[int, str]]:
+    """
+    Создание пользователей многострочными INSERT и запись рассылки с данными для входа
+    каждому созданному пользователю в одной транзакции
+
+    Почты, занятые параллельной регистрацией, пропускаются (ON CONFLICT DO NOTHING)
+
+    Returns:
+        list[tuple[int, str]]: id и почта созданных пользователей
+    """
+    created = []
+    for start in range(0, len(users), batch_size):
+        # defaults of the model are evaluated once at import, timestamps are set explicitly
+        rows = [
+            user.dict() | {"first_access": func.now(), "last_access": func.now()}
+            for user in users[start : start + batch_size]
+        ]
+        db_query = (
+            pg_insert(models.User)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[models.User.email])
+            .returning(models.User.id, models.User.email)
+        )
+        created_batch = [tuple(row) for row in db.execute(db_query)]
+        if created_batch:
+            db.execute(
+                insert(models.Mailing).values(
+                    [
+                        {
+                            "sender_id": sender.id,
+                            "target_id": user_id,
+                            "time_sent": func.now(),
+                            "subject": subject,
+                        }
+                        for user_id, _ in created_batch
+                    ]
+                )
+            )
+        created.extend(created_batch)
+    db.commit()
+    return created
+
+
 # endregion User
 
 # region Feedback
@@ -120,8 +209,8 @@ def update_user_mentor_vacancy(
 
     db_mentor = db.query(models.User).filter(models.User.id == mentor_id).one_or_none()
 
-    log.debug(f"Vacancy: {db_vacancy}")
-    log.debug(f"Mentor: {db_mentor}")
+    log.debug("Vacancy: %s", db_vacancy)
+    log.debug("Mentor: %s", db_mentor)
     if db_mentor is None:
         raise ValueError("Mentor not found")
     if db_vacancy is None:
@@ -132,6 +221,7 @@ def update_user_mentor_vacancy(
         mentor_id=db_mentor.id, vacancy_id=db_vacancy.id
     )
     db.add(db_offer)
+    bump_entity_version(db, EntityName.vacancies)
 
     db.commit()
     db.refresh(db_offer)
@@ -162,6 +252,7 @@ def update_user_accept_offer(
 
     db_offer.mentor_status = MentorStatus.active.value
     db_offer.mentor = mentor
+    bump_entity_version(db, EntityName.vacancies)
     db.commit()
     db.refresh(db_offer)
 
@@ -178,7 +269,7 @@ def get_offers(db: Session, user: models.User, limit: int, offset: int) -> list
             .limit(limit)
             .all()
         )
-        log.debug(f"Offers for {user}: {db_data}")
+        log.debug("Offers for %s: %s", user, db_data)
         return db_data
     elif user.role == UserRole.hr.value:
         # get all vacancies created by hr and find all related MentorVacancyOffers
@@ -193,7 +284,7 @@ def get_offers(db: Session, user: models.User, limit: int, offset: int) -> list
         db_data = [
             i.mentor_vacancy_offers for i in db_vacancies if i.mentor_vacancy_offers
         ]
-        log.debug(f"Offers from {user}: {db_data}")
+        log.debug("Offers from %s: %s", user, db_data)
         return flatten(db_data)
 
         # db_vacancies = (db.query(models.Vacancy).filter(models.Vacancy.hr_id == user.id)).all()
@@ -215,7 +306,7 @@ def get_users_available_mentors(
         .all()
     )
 
-    log.debug(f"Available mentors: {db_data}")
+    log.debug("Available mentors: %s", db_data)
     return db_data
 
 
@@ -238,6 +329,8 @@ def create_intern_application(
 ) -> models.InternApplication:
     db_application = models.InternApplication(**application.dict())
     db.add(db_application)
+    db.flush()
+    invalidation.publish(db, CachedEntity.intern_applications, db_application.id)
     db.commit()
     db.refresh(db_application)
     return db_application
@@ -255,6 +348,7 @@ def update_intern_application(
     db_application.graduation_date = application.graduation_date
 
     db_application = db.merge(db_application)
+    invalidation.publish(db, CachedEntity.intern_applications, db_application.id)
     db.commit()
     db.refresh(db_application)
     return db_application
@@ -351,7 +445,7 @@ def get_intern_application_stats(db: Session, param: InternApplicationParameters
             .all()
         )
 
-    log.debug(f"Intern applications: {db_data}")
+    log.debug("Intern applications: %s", db_data)
     return db_data
 
 
@@ -365,7 +459,7 @@ def get_all_intern_applications(
     if status:
         db_query = db_query.filter(models.InternApplication.status == status.value)
     db_data = db_query.offset(offset).limit(limit).all()
-    log.debug(f"Intern applications: {db_data}")
+    log.debug("Intern applications: %s", db_data)
     return db_data
 
 
@@ -382,7 +476,7 @@ def get_intern_application_by_id(
         .one_or_none()
     )
     if db_data:
-        log.debug(f"Intern application: {db_data}")
+        log.debug("Intern application: %s", db_data)
         return db_data
     raise ValueError("Intern application not found")
 
@@ -398,6 +492,7 @@ def update_intern_application_status(
     if db_data is None:
         raise ValueError("Intern application not found")
     db_data.status = status.value
+    invalidation.publish(db, CachedEntity.intern_applications, db_data.id)
     db.commit()
     return db_data
 
@@ -417,7 +512,7 @@ def get_all_tags(db: Session) -> list[tuple[str, int]]:
         .limit(10)
         .all()
     )
-    log.debug(f"tags: {data}")
+    log.debug("tags: %s", data)
 
     return [tuple(i) for i in data]
 
@@ -434,7 +529,7 @@ def get_all_cities(db: Session) -> list[str] | None:
         .limit(10)
         .all()
     )
-    log.debug(f"cities: {data}")
+    log.debug("cities: %s", data)
     return [i[0] for i in data]
 
 
@@ -450,7 +545,7 @@ def get_all_organisations(db: Session) -> list[str] | None:
         .limit(10)
         .all()
     )
-    log.debug(f"organisations: {data}")
+    log.debug("organisations: %s", data)
     return [i[0] for i in data]
 
 
@@ -478,6 +573,7 @@ def create_vacancy(
         db_vacancy.tags.append(db_tag)
 
     db.add(db_vacancy)
+    bump_entity_version(db, EntityName.vacancies)
     db.commit()
     db.refresh(db_vacancy)
     return db_vacancy
@@ -496,7 +592,7 @@ def get_vacancies(
 
     data = filters.dict()
 
-    log.debug(f"filters: {data}")
+    log.debug("filters: %s", data)
     if data["organisations"] is None:
         data["organisations"] = []
     if data["tags"] is None:
@@ -509,7 +605,7 @@ def get_vacancies(
     if not any(data.values()):
         return db_query.offset(offset).limit(limit).all()
 
-    log.debug(f"status: {status}")
+    log.debug("status: %s", status)
     db_query = db_query.join(models.Vacancy.tags).filter(
         or_(
             models.Tag.name.in_(data["tags"]),
@@ -520,7 +616,7 @@ def get_vacancies(
 
     db_vacancies = db_query.offset(offset).limit(limit).all()
 
-    log.debug(f"vacancies: {db_vacancies}")
+    log.debug("vacancies: %s", db_vacancies)
     return db_vacancies
 
 
@@ -533,9 +629,10 @@ def publish_vacancy(db: Session, db_user: models.User):
     if db_vacancy is None:
         raise Exception("Vacancy not found")
     db_vacancy.status = "published"
+    bump_entity_version(db, EntityName.vacancies)
     db.commit()
     db.refresh(db_vacancy)
-    log.debug(f"published vacancy: {db_vacancy} by {db_user}")
+    log.debug("published vacancy: %s by %s", db_vacancy, db_user)
     return db_vacancy
 
 
@@ -551,6 +648,7 @@ def delete_vacancy(db: Session, vacancy_id: int):
     ).delete()
 
     db_vacancy.status = "closed"
+    bump_entity_version(db, EntityName.vacancies)
     db.commit()
     db.refresh(db_vacancy)
     return db_vacancy
@@ -632,6 +730,7 @@ def get_recieved_mailings(
 def create_event(db: Session, event: schemas.EventCreate) -> models.Event:
     db_event = models.Event(**event.dict())
     db.add(db_event)
+    bump_entity_version(db, EntityName.events)
     db.commit()
     db.refresh(db_event)
     return db_event
@@ -651,93 +750,504 @@ def get_events_scores(
         .limit(limit)
         .all()
     )
-    log.debug(f"events scores: {db_data}")
+    log.debug("events scores: %s", db_data)
     return db_data
 
 
+def refresh_candidate_score_totals(db: Session) -> int:
+    # recalculate read model with overall scores for every candidate
+    max_score = db.query(func.coalesce(func.sum(models.Event.max_score), 0)).scalar()
+    db.query(models.CandidateScoreTotal).delete()
+    db_scores = (
+        select(
+            models.EventScore.user_id,
+            func.sum(models.EventScore.score),
+            literal(max_score),
+            func.percent_rank().over(order_by=func.sum(models.EventScore.score)),
+            func.now(),
+        )
+        .join(models.EventScore.event)
+        .group_by(models.EventScore.user_id)
+    )
+    result = db.execute(
+        insert(models.CandidateScoreTotal).from_select(
+            ["user_id", "score", "max_score", "percentile", "updated_at"], db_scores
+        )
+    )
+    db.commit()
+
+    log.debug("candidate score totals refreshed: %s", result.rowcount)
+    return result.rowcount
+
+
 def get_candidates_scores(db: Session, limit: int, offset: int):
-    # get all event scores and max_score for all events grouped by user id and fio
+    # get precalculated scores of all candidates ordered by overall score
     db_data = (
         db.query(
-            models.User.id.label("user_id"),
-            # models.User.fio,
-            func.sum(models.EventScore.score).label("score"),
-            db.query(func.sum(models.Event.max_score).label("max_score")).one()[0],
+            models.CandidateScoreTotal.user_id,
+            models.CandidateScoreTotal.score,
+            models.CandidateScoreTotal.max_score,
+        )
+        .order_by(
+            desc(models.CandidateScoreTotal.score),
+            models.CandidateScoreTotal.user_id,
         )
-        .join(models.EventScore.user)
-        .join(models.EventScore.event)
-        .group_by(models.User.id)
         .offset(offset)
         .limit(limit)
         .all()
     )
 
-    log.debug(f"candidates scores: {db_data}")
+    log.debug("candidates scores: %s", db_data)
     return db_data
 
 
-def get_candidate_score_by_id(db: Session, candidate_id: int):
-    # get event scores for candidate by id
-    # db_data = (
-    #     db.query(
-    #         models.Event.id,
-    #         models.EventScore.score,
-    #         models.Event.max_score,
-    #     )
-    #     .join(models.EventScore.user)
-    #     .join(models.EventScore.event)
-    #     .filter(models.User.id == candidate_id)
-    #     .all()
-    # )
+def get_candidates_top(db: Session, k: int):
+    # get k best candidates using index on overall score
     db_data = (
         db.query(
-            models.User.id.label("user_id"),
-            # models.User.fio,
-            func.sum(models.EventScore.score).label("score"),
-            db.query(func.sum(models.Event.max_score).label("max_score")).one()[0],
+            models.CandidateScoreTotal.user_id,
+            models.User.fio,
+            models.CandidateScoreTotal.score,
+            models.CandidateScoreTotal.max_score,
+            models.CandidateScoreTotal.percentile,
         )
-        .filter(models.User.id == candidate_id)
-        .join(models.EventScore.user)
-        .join(models.EventScore.event)
-        .group_by(models.User.id)
+        .join(models.CandidateScoreTotal.user)
+        .order_by(
+            desc(models.CandidateScoreTotal.score),
+            models.CandidateScoreTotal.user_id,
+        )
+        .limit(k)
         .all()
     )
 
-    log.debug(f"candidate score: {db_data}")
+    log.debug("candidates top: %s", db_data)
     return db_data
 
 
+def get_candidates_score_histogram(db: Session, bins: int) -> list[tuple[int, int]]:
+    # count candidates in equal-width buckets of score ratio, ratio 1.0 goes to last bucket
+    ratio = (
+        models.CandidateScoreTotal.score
+        * 1.0
+        / func.nullif(models.CandidateScoreTotal.max_score, 0)
+    )
+    bucket = func.least(
+        func.width_bucket(func.coalesce(ratio, 0), 0, 1, bins), bins
+    ).label("bucket")
+    db_data = (
+        db.query(bucket, func.count().label("count"))
+        .group_by("bucket")
+        .order_by("bucket")
+        .all()
+    )
+
+    log.debug("candidates histogram: %s", db_data)
+    return [tuple(i) for i in db_data]
+
+
+def get_candidate_score_by_id(db: Session, candidate_id: int):
+    # get precalculated scores for candidate by id
+    db_data = (
+        db.query(
+            models.CandidateScoreTotal.user_id,
+            models.CandidateScoreTotal.score,
+            models.CandidateScoreTotal.max_score,
+        )
+        .filter(models.CandidateScoreTotal.user_id == candidate_id)
+        .one_or_none()
+    )
+
+    log.debug("candidate score: %s", db_data)
+    return db_data
+
+
+def get_score_import_digests(db: Session, kind: str) -> dict[str, str]:
+    return dict(
+        db.query(models.ScoreImportDigest.key, models.ScoreImportDigest.digest)
+        .filter(models.ScoreImportDigest.kind == kind)
+        .all()
+    )
+
+
+def save_score_import_digests(db: Session, kind: str, digests: dict[str, str]) -> None:
+    if not digests:
+        return
+    db_query = pg_insert(models.ScoreImportDigest)
+    db.execute(
+        db_query.on_conflict_do_update(
+            index_elements=[
+                models.ScoreImportDigest.kind,
+                models.ScoreImportDigest.key,
+            ],
+            set_={"digest": db_query.excluded.digest},
+        ),
+        [{"kind": kind, "key": k, "digest": v} for k, v in digests.items()],
+    )
+
+
 def create_students_events_scores(
     db: Session,
     students: list[schemas.StudentTrackInfo],
     events: list[schemas.EventCreate],
-):
-    for student in students:
-        db_student = (
-            db.query(models.User).filter(models.User.fio == student.fio).one_or_none()
-        )
-        if db_student is None:
-            raise Exception("Student not found")
-        db_scores = []
-        for index, event in enumerate(events):
-            db_event = (
-                db.query(models.Event)
-                .filter(models.Event.title == event.title)
-                .one_or_none()
+) -> schemas.ScoreImportDiff:
+    # only cells in changed rows and changed columns can differ from the previous import
+    diff = schemas.ScoreImportDiff(rows_total=len(students), columns_total=len(events))
+
+    stored_rows = get_score_import_digests(db, "row")
+    stored_columns = get_score_import_digests(db, "column")
+    row_digests = {s.fio: score_digest.row_digest(s, events) for s in students}
+    column_digests = {
+        e.title: score_digest.column_digest(i, e, students)
+        for i, e in enumerate(events)
+    }
+    changed_students = [
+        s for s in students if stored_rows.get(s.fio) != row_digests[s.fio]
+    ]
+    changed_columns = [
+        i
+        for i, e in enumerate(events)
+        if stored_columns.get(e.title) != column_digests[e.title]
+    ]
+    diff.rows_changed = len(changed_students)
+    diff.columns_changed = len(changed_columns)
+    if not changed_students and not changed_columns:
+        return diff
+
+    db_events = {
+        db_event.title: db_event
+        for db_event in db.query(models.Event)
+        .filter(models.Event.title.in_([e.title for e in events]))
+        .all()
+    }
+    for index in changed_columns:
+        event = events[index]
+        db_event = db_events.get(event.title)
+        if db_event is None:
+            db_event = models.Event(**event.dict())
+            db.add(db_event)
+            db_events[event.title] = db_event
+            diff.events_created += 1
+        elif (db_event.start_date, db_event.max_score) != (
+            event.start_date,
+            event.max_score,
+        ):
+            db_event.start_date = event.start_date
+            db_event.max_score = event.max_score
+            diff.events_updated += 1
+    if diff.events_created or diff.events_updated:
+        bump_entity_version(db, EntityName.events)
+    db.flush()
+
+    fio_index = FioIndex(
+        db.query(models.User.id, models.User.fio).all(),
+        settings.FIO_SIMILARITY_THRESHOLD,
+    )
+    db_students = {}
+    matched_students = []
+    for student in changed_students:
+        match = fio_index.match(student.fio)
+        if match.user_id is None:
+            diff.unmatched.append(schemas.StudentMatch.from_orm(match))
+            continue
+        if student.fio in db_students or match.user_id in db_students.values():
+            # the upsert can't update the same (user, event) row twice,
+            # only the first row of a user is imported
+            diff.duplicates.append(schemas.StudentMatch.from_orm(match))
+            continue
+        if match.method == "fuzzy":
+            diff.fuzzy_matched.append(schemas.StudentMatch.from_orm(match))
+        db_students[student.fio] = match.user_id
+        matched_students.append(student)
+    # rows of unmatched and duplicate students are retried on the next import
+    changed_students = matched_students
+    duplicate_fios = {match.fio for match in diff.duplicates}
+
+    event_ids = [db_events[events[i].title].id for i in changed_columns]
+    stored_scores = {
+        (user_id, event_id): score
+        for user_id, event_id, score in db.query(
+            models.EventScore.user_id,
+            models.EventScore.event_id,
+            models.EventScore.score,
+        )
+        .filter(
+            models.EventScore.user_id.in_(db_students.values()),
+            models.EventScore.event_id.in_(event_ids),
+        )
+        .all()
+    }
+    changed_scores = []
+    for student in changed_students:
+        user_id = db_students[student.fio]
+        for index, event_id in zip(changed_columns, event_ids):
+            score = student.scores[index]
+            stored_score = stored_scores.get((user_id, event_id))
+            if stored_score == score:
+                diff.scores_unchanged += 1
+                continue
+            if stored_score is None:
+                diff.scores_created += 1
+            else:
+                diff.scores_updated += 1
+            changed_scores.append(
+                {"user_id": user_id, "event_id": event_id, "score": score}
             )
-            if db_event is None:
-                db_event = create_event(db, event)
-                # raise Exception("Event not found")
-
-            db_scores.append(
-                models.EventScore(
-                    user_id=db_student.id,
-                    event_id=db_event.id,
-                    score=student.scores[index],
-                )
+
+    if changed_scores:
+        db_query = pg_insert(models.EventScore)
+        db.execute(
+            db_query.on_conflict_do_update(
+                index_elements=[models.EventScore.user_id, models.EventScore.event_id],
+                set_={"score": db_query.excluded.score},
+            ),
+            changed_scores,
+        )
+
+    save_score_import_digests(
+        db,
+        "row",
+        {
+            s.fio: row_digests[s.fio]
+            for s in changed_students
+            if s.fio not in duplicate_fios
+        },
+    )
+    if not diff.unmatched and not diff.duplicates:
+        # otherwise cells of unmatched students have to be compared again
+        save_score_import_digests(
+            db,
+            "column",
+            {events[i].title: column_digests[events[i].title] for i in changed_columns},
+        )
+    db.commit()
+
+    if changed_scores or diff.events_created or diff.events_updated:
+        refresh_candidate_score_totals(db)
+
+    log.debug("scores import: %s", diff)
+    return diff
+
+
+def upsert_educational_tracks(
+    db: Session, tracks: list[schemas.EducationalTrack]
+) -> list[models.EducationalTrack]:
+    if not tracks:
+        return []
+    # one row per track name, otherwise upsert affects the same row twice
+    unique_tracks = {t.name: t.dict() for t in tracks}
+    db_query = pg_insert(models.EducationalTrack).values(list(unique_tracks.values()))
+    db.execute(
+        db_query.on_conflict_do_update(
+            index_elements=[models.EducationalTrack.name],
+            set_={"required_pass_rate": db_query.excluded.required_pass_rate},
+        )
+    )
+    db.commit()
+    return get_educational_tracks(db)
+
+
+def get_educational_tracks(db: Session) -> list[models.EducationalTrack]:
+    return db.query(models.EducationalTrack).order_by(models.EducationalTrack.id).all()
+
+
+def update_educational_track_events(
+    db: Session, track_id: int, event_ids: list[int]
+) -> models.EducationalTrack:
+    db_track = (
+        db.query(models.EducationalTrack)
+        .filter(models.EducationalTrack.id == track_id)
+        .one_or_none()
+    )
+    if db_track is None:
+        raise ValueError("Track not found")
+    db_events = db.query(models.Event).filter(models.Event.id.in_(event_ids)).all()
+    if len(db_events) != len(set(event_ids)):
+        raise ValueError("Event not found")
+
+    db_track.events = db_events
+    db.commit()
+    db.refresh(db_track)
+    return db_track
+
+
+def get_events_max_scores(db: Session) -> list[tuple[int, int]]:
+    return [
+        tuple(i)
+        for i in db.query(models.Event.id, models.Event.max_score)
+        .order_by(models.Event.id)
+        .all()
+    ]
+
+
+def get_events_tracks(db: Session) -> list[tuple[int, int]]:
+    # pairs (track_id, event_id)
+    return [
+        tuple(i)
+        for i in db.execute(
+            select(models.event_tracks.c.track_id, models.event_tracks.c.event_id)
+        ).all()
+    ]
+
+
+def get_all_events_scores(db: Session) -> list[tuple[int, int, int]]:
+    # triples (user_id, event_id, score) for building user x event score matrix
+    return [
+        tuple(i)
+        for i in db.execute(
+            select(
+                models.EventScore.user_id,
+                models.EventScore.event_id,
+                models.EventScore.score,
             )
-        db.add_all(db_scores)
-        db.commit()
+        ).all()
+    ]
+
+
+def replace_track_results(db: Session, results: list[dict]) -> None:
+    db.query(models.TrackResult).delete()
+    if results:
+        db.execute(insert(models.TrackResult), results)
+    db.commit()
+
+
+def get_track_results(
+    db: Session,
+    limit: int,
+    offset: int,
+    track_id: int | None = None,
+    passed: bool | None = None,
+) -> list[models.TrackResult]:
+    db_query = db.query(models.TrackResult)
+    if track_id is not None:
+        db_query = db_query.filter(models.TrackResult.track_id == track_id)
+    if passed is not None:
+        db_query = db_query.filter(models.TrackResult.passed == passed)
+    db_data = (
+        db_query.order_by(models.TrackResult.track_id, models.TrackResult.user_id)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+    log.debug("track results: %s", db_data)
+    return db_data
+
+
+def get_user_track_results(
+    db: Session, db_user: models.User
+) -> list[models.TrackResult]:
+    return (
+        db.query(models.TrackResult)
+        .filter(models.TrackResult.user_id == db_user.id)
+        .order_by(models.TrackResult.track_id)
+        .all()
+    )
 
 
 # endregion Educational_courses
+
+
+# region Export
+
+
+def export_intern_applications(
+    db: Session,
+    batch_size: int,
+    status: InternApplicationStatus | None = None,
+) -> MappingResult:
+    # rows are fetched from a server-side cursor batch_size at a time
+    stmt = (
+        select(
+            models.InternApplication.id,
+            models.User.fio,
+            models.User.email,
+            models.User.phone,
+            models.User.birthday,
+            models.InternApplication.city,
+            models.InternApplication.citizenship,
+            models.InternApplication.education,
+            models.InternApplication.course,
+            models.InternApplication.graduation_date,
+            models.InternApplication.resume,
+            models.InternApplication.status,
+        )
+        .join(models.User, models.User.id == models.InternApplication.id)
+        .order_by(models.InternApplication.id)
+    )
+    if status:
+        stmt = stmt.where(models.InternApplication.status == status.value)
+    return db.execute(stmt.execution_options(yield_per=batch_size)).mappings()
+
+
+def export_candidates_scores(db: Session, batch_size: int) -> MappingResult:
+    stmt = (
+        select(
+            models.CandidateScoreTotal.user_id,
+            models.User.fio,
+            models.User.email,
+            models.CandidateScoreTotal.score,
+            models.CandidateScoreTotal.max_score,
+            models.CandidateScoreTotal.percentile,
+            models.CandidateScoreTotal.updated_at,
+        )
+        .join(models.User, models.User.id == models.CandidateScoreTotal.user_id)
+        .order_by(
+            desc(models.CandidateScoreTotal.score),
+            models.CandidateScoreTotal.user_id,
+        )
+    )
+    return db.execute(stmt.execution_options(yield_per=batch_size)).mappings()
+
+
+def export_mailings(db: Session, batch_size: int) -> MappingResult:
+    sender = aliased(models.User)
+    target = aliased(models.User)
+    stmt = (
+        select(
+            models.Mailing.id,
+            models.Mailing.time_sent,
+            models.Mailing.subject,
+            models.Mailing.sender_id,
+            sender.email.label("sender_email"),
+            models.Mailing.target_id,
+            target.fio.label("target_fio"),
+            target.email.label("target_email"),
+        )
+        .join(sender, sender.id == models.Mailing.sender_id)
+        .join(target, target.id == models.Mailing.target_id)
+        .order_by(models.Mailing.id)
+    )
+    return db.execute(stmt.execution_options(yield_per=batch_size)).mappings()
+
+
+def get_export_events(db: Session) -> list[models.Event]:
+    # columns of the "Программа развития" sheet
+    return (
+        db.query(models.Event).order_by(models.Event.start_date, models.Event.id).all()
+    )
+
+
+def export_activity_scores(db: Session, batch_size: int) -> MappingResult:
+    # scores grouped by student, one row of the "Программа развития" sheet per student
+    stmt = (
+        select(
+            models.EventScore.user_id,
+            models.User.fio,
+            models.InternApplication.course,
+            models.EventScore.event_id,
+            models.EventScore.score,
+        )
+        .join(models.User, models.User.id == models.EventScore.user_id)
+        .outerjoin(
+            models.InternApplication,
+            models.InternApplication.id == models.EventScore.user_id,
+        )
+        .order_by(models.User.fio, models.EventScore.user_id)
+    )
+    return db.execute(stmt.execution_options(yield_per=batch_size)).mappings()
+
+
+# endregion Export
+
+
+# timings of every crud function are exposed on /metrics
+time_module_functions(globals(), __name__)
@@ -1,15 +1,63 @@
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+import orjson
+import time
 
 from app.utils.settings import settings
 from app.utils.serializer import _custom_json_serializer
+from app.utils.logging import log
+from app.utils.query_stats import current_query_stats
 
 engine = create_engine(
     str(settings.DATABASE_URI),
     json_serializer=_custom_json_serializer,  # , connect_args={"check_same_thread": False}
+    json_deserializer=orjson.loads,
 )
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+
+    if duration * 1000 < settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+    log.warning("slow query %.1f ms: %s %s", duration * 1000, statement, parameters)
+    if (
+        settings.SQL_DEBUG
+        and not executemany
+        and statement.lstrip().upper().startswith("SELECT")
+    ):
+        log.warning("query plan:\n%s", explain(cursor, statement, parameters))
+
+
+def explain(cursor, statement: str, parameters) -> str:
+    # the plan is read with a raw DBAPI cursor, so these statements skip the hooks above;
+    # the savepoint keeps the request transaction usable if EXPLAIN fails
+    plan_cursor = cursor.connection.cursor()
+    try:
+        plan_cursor.execute("SAVEPOINT explain_plan")
+        try:
+            plan_cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+            plan = "\n".join(row[0] for row in plan_cursor.fetchall())
+        except Exception as e:
+            plan_cursor.execute("ROLLBACK TO SAVEPOINT explain_plan")
+            plan = f"EXPLAIN failed: {e}"
+        plan_cursor.execute("RELEASE SAVEPOINT explain_plan")
+        return plan
+    finally:
+        plan_cursor.close()
+
+
 SessionLocal = sessionmaker(autoflush=True, bind=engine)
 
 Base = declarative_base()
@@ -0,0 +1,164 @@
+"""
+Сброс кэшей в памяти во всех воркерах при изменении данных
+
+Функции crud вызывают publish(db, сущность, id) внутри своей транзакции: событие
+отправляется в канал postgres через pg_notify и доставляется слушателям только после
+коммита (при откате теряется вместе с транзакцией). В своем процессе обработчики
+вызываются сразу после коммита, в остальных - потоком-слушателем, который держит
+отдельное соединение с LISTEN. Обработчики регистрируются декоратором on_change.
+"""
+
+import os
+import select
+import socket
+import threading
+from collections import defaultdict
+from typing import Callable
+
+import orjson
+import psycopg2
+from sqlalchemy import event, func
+from sqlalchemy import select as sql_select
+from sqlalchemy.orm import Session
+
+from app.data.constants import CachedEntity
+from app.utils.logging import log
+from app.utils.metrics import cache_invalidations_total
+from app.utils.settings import settings
+
+Handler = Callable[[int | None], None]
+
+_handlers: dict[str, list[Handler]] = defaultdict(list)
+_listener: threading.Thread | None = None
+_listener_stop = threading.Event()
+
+
+def _source() -> str:
+    # pids repeat across containers, the hostname tells them apart
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def on_change(entity: CachedEntity) -> Callable[[Handler], Handler]:
+    """
+    Регистрация обработчика изменения сущности
+
+    Обработчик получает id измененной записи или None, если нужно сбросить все
+    """
+
+    def decorator(handler: Handler) -> Handler:
+        _handlers[entity.value].append(handler)
+        return handler
+
+    return decorator
+
+
+def publish(db: Session, entity: CachedEntity, entity_id: int | None = None) -> None:
+    """
+    Событие об изменении сущности, отправляется при коммите транзакции db
+    """
+    db.info.setdefault("invalidations", set()).add((entity.value, entity_id))
+    if not settings.CACHE_INVALIDATION_ENABLED:
+        return
+    payload = orjson.dumps(
+        {"entity": entity.value, "id": entity_id, "source": _source()}
+    )
+    db.execute(
+        sql_select(
+            func.pg_notify(settings.CACHE_INVALIDATION_CHANNEL, payload.decode())
+        )
+    )
+
+
+def dispatch(entity: str, entity_id: int | None, source: str) -> None:
+    for handler in _handlers.get(entity, ()):
+        try:
+            handler(entity_id)
+        except Exception:
+            log.exception("cache invalidation handler %s failed", handler.__qualname__)
+    cache_invalidations_total.inc(entity, source)
+
+
+def dispatch_all(source: str) -> None:
+    for entity in list(_handlers):
+        dispatch(entity, None, source)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    for entity, entity_id in session.info.pop("invalidations", ()):
+        dispatch(entity, entity_id, "local")
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop("invalidations", None)
+
+
+def _receive(payload: str) -> None:
+    try:
+        message = orjson.loads(payload)
+        entity, entity_id, source = message["entity"], message["id"], message["source"]
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        log.warning("invalid cache invalidation payload: %s", payload)
+        return
+    # own events were already handled right after the commit
+    if source != _source():
+        dispatch(entity, entity_id, "notify")
+
+
+def _listen(stop: threading.Event, reconnect: bool) -> None:
+    connection = psycopg2.connect(
+        str(settings.DATABASE_URI),
+        # detect a dead connection while waiting for notifications
+        keepalives=1,
+        keepalives_idle=30,
+        keepalives_interval=10,
+        keepalives_count=3,
+    )
+    try:
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {settings.CACHE_INVALIDATION_CHANNEL}")
+        log.info("listening for cache invalidations in worker %s", _source())
+        if reconnect:
+            # events sent while the listener was disconnected are lost
+            dispatch_all("reconnect")
+        while not stop.is_set():
+            if not select.select([connection], [], [], 1)[0]:
+                continue
+            connection.poll()
+            while connection.notifies:
+                _receive(connection.notifies.pop(0).payload)
+    finally:
+        connection.close()
+
+
+def _run(stop: threading.Event) -> None:
+    reconnect = False
+    while not stop.is_set():
+        try:
+            _listen(stop, reconnect)
+        except (psycopg2.Error, OSError) as e:
+            log.warning("cache invalidation listener disconnected: %s", e)
+        reconnect = True
+        stop.wait(settings.CACHE_INVALIDATION_RETRY)
+
+
+def start_listener() -> None:
+    global _listener
+    if not settings.CACHE_INVALIDATION_ENABLED or _listener is not None:
+        return
+    _listener_stop.clear()
+    _listener = threading.Thread(
+        target=_run, args=(_listener_stop,), name="cache-invalidation", daemon=True
+    )
+    _listener.start()
+
+
+def stop_listener() -> None:
+    global _listener
+    if _listener is None:
+        return
+    _listener_stop.set()
+    _listener.join(timeout=5)
+    _listener = None
@@ -8,6 +8,8 @@ from sqlalchemy import (
     Date,
     Column,
     Table,
+    Float,
+    UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import JSON
 from sqlalchemy.orm import relationship, mapped_column, Mapped
@@ -145,10 +147,14 @@ class Event(Base):
     scores = relationship("EventScore", back_populates="event")
     enrolments = relationship("UserEnrolment", back_populates="event")
     event_scores = relationship("EventScore", back_populates="event")
+    tracks = relationship(
+        "EducationalTrack", back_populates="events", secondary="event_tracks"
+    )
 
 
 class EventScore(Base):
     __tablename__ = "event_scores"
+    __table_args__ = (UniqueConstraint("user_id", "event_id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
@@ -162,6 +168,98 @@ class EventScore(Base):
         return f"<EventScore(user_id={self.user_id}, event_id={self.event_id}, score={self.score})>"
 
 
+class EducationalTrack(Base):
+    """
+    Образовательный трек из листа "Программа развития (инфо)"
+    """
+
+    __tablename__ = "educational_tracks"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String, unique=True)
+    required_pass_rate: Mapped[float] = mapped_column(Float)
+
+    events = relationship("Event", back_populates="tracks", secondary="event_tracks")
+
+    @property
+    def event_ids(self) -> list[int]:
+        return [event.id for event in self.events]
+
+    def __repr__(self):
+        return f"<EducationalTrack(id={self.id}, name={self.name}, required_pass_rate={self.required_pass_rate})>"
+
+
+event_tracks = Table(
+    "event_tracks",
+    Base.metadata,
+    Column("event_id", Integer, ForeignKey("events.id"), primary_key=True),
+    Column("track_id", Integer, ForeignKey("educational_tracks.id"), primary_key=True),
+)
+
+
+class TrackResult(Base):
+    """
+    Результат прохождения образовательного трека кандидатом
+
+    Пересчитывается после загрузки оценок (track_service.evaluate_tracks)
+    """
+
+    __tablename__ = "track_results"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), primary_key=True
+    )
+    track_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("educational_tracks.id"), primary_key=True, index=True
+    )
+    score: Mapped[int] = mapped_column(Integer)
+    max_score: Mapped[int] = mapped_column(Integer)
+    pass_rate: Mapped[float] = mapped_column(Float)
+    passed: Mapped[bool] = mapped_column(Boolean)
+
+    def __repr__(self):
+        return f"<TrackResult(user_id={self.user_id}, track_id={self.track_id}, pass_rate={self.pass_rate}, passed={self.passed})>"
+
+
+class CandidateScoreTotal(Base):
+    """
+    Агрегированные баллы кандидата по всем мероприятиям (read model для куратора)
+
+    Пересчитывается после загрузки оценок (crud.refresh_candidate_score_totals)
+    """
+
+    __tablename__ = "candidate_score_totals"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), primary_key=True
+    )
+    score: Mapped[int] = mapped_column(Integer, index=True)
+    max_score: Mapped[int] = mapped_column(Integer)
+    # доля кандидатов с меньшим количеством баллов (percent_rank)
+    percentile: Mapped[float] = mapped_column(Float, default=0)
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime, default=datetime.datetime.now
+    )
+
+    user = relationship("User")
+
+    def __repr__(self):
+        return f"<CandidateScoreTotal(user_id={self.user_id}, score={self.score}, max_score={self.max_score})>"
+
+
+class ScoreImportDigest(Base):
+    """
+    Хеши строк студентов (kind="row") и колонок мероприятий (kind="column")
+    из последней загрузки "Программы развития", используются для инкрементальной загрузки
+    """
+
+    __tablename__ = "score_import_digests"
+
+    kind: Mapped[str] = mapped_column(String, primary_key=True)
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    digest: Mapped[str] = mapped_column(String)
+
+
 class UserEnrolment(Base):
     __tablename__ = "user_enrolments"
 
@@ -375,6 +473,17 @@ class Mailing(Base):
     )
 
 
+class EntityVersion(Base):
+    """
+    Счетчик изменений сущности, увеличивается в той же транзакции, что и изменение
+    """
+
+    __tablename__ = "entity_versions"
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
+
+
 class ExternalServiceLink(Base):
     __tablename__ = "external_service_links"
 
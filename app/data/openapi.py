@@ -19,3 +19,17 @@ def get_openapi_schema(app: FastAPI):
         },
     }
     return schema
+
+
+def setup_openapi(app: FastAPI) -> None:
+    """
+    Схема строится при первом запросе /openapi.json или /docs, когда все роутеры
+    уже подключены, и кэшируется на время жизни процесса
+    """
+
+    def openapi() -> dict:
+        if app.openapi_schema is None:
+            app.openapi_schema = get_openapi_schema(app)
+        return app.openapi_schema
+
+    app.openapi = openapi
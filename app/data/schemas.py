@@ -12,37 +12,35 @@ class UserLogin(BaseModel):
     stay_loggedin: Optional[bool] = False
 
     class Config:
-        schema_extra = {
-            "examples": {
-                "curator": {
-                    "value": {
-                        "email": "test@mipt.ru",
-                        "password": "test123456",
-                        "stay_loggedin": False,
-                    },
-                },
-                "hr": {
-                    "value": {
-                        "email": "test@misis.com",
-                        "password": "test123456",
-                        "stay_loggedin": False,
-                    }
-                },
-                "candidate": {
-                    "value": {
-                        "email": "test@mephi.com",
-                        "password": "test123456",
-                        "stay_loggedin": False,
-                    }
+        body_examples = {
+            "curator": {
+                "value": {
+                    "email": "test@mipt.ru",
+                    "password": "test123456",
+                    "stay_loggedin": False,
                 },
-                "mentor": {
-                    "value": {
-                        "email": "test@hse.com",
-                        "password": "test123456",
-                        "stay_loggedin": False,
-                    }
-                },
-            }
+            },
+            "hr": {
+                "value": {
+                    "email": "test@misis.com",
+                    "password": "test123456",
+                    "stay_loggedin": False,
+                }
+            },
+            "candidate": {
+                "value": {
+                    "email": "test@mephi.com",
+                    "password": "test123456",
+                    "stay_loggedin": False,
+                }
+            },
+            "mentor": {
+                "value": {
+                    "email": "test@hse.com",
+                    "password": "test123456",
+                    "stay_loggedin": False,
+                }
+            },
         }
 
 
@@ -61,55 +59,53 @@ class UserCreate(UserBase):
     password: str
 
     class Config:
-        schema_extra = {
-            "examples": {
-                "curator": {
-                    "value": {
-                        "email": "test@mipt.ru",
-                        "phone": "+7 (999) 999-99-99",
-                        "gender": "М",
-                        "birthday": datetime.now().date(),
-                        "fio": "Сурначев Михаил Дмитриевич",
-                        "password": "test123456",
-                        "role": "curator",
-                    }
-                },
-                "hr": {
-                    "value": {
-                        "email": "test@misis.com",
-                        "phone": "+7 (999) 999-99-99",
-                        "gender": "М",
-                        "birthday": datetime.now().date(),
-                        "fio": "Куренков Владимир Вячеславович",
-                        "password": "test123456",
-                        "role": "hr",
-                    },
-                },
-                "mentor": {
-                    "value": {
-                        "email": "test@hse.com",
-                        "phone": "+7 (999) 999-99-99",
-                        "gender": "Ж",
-                        "birthday": datetime.now().date(),
-                        "fio": "Горденко Мария Константиновна",
-                        "password": "test123456",
-                        "role": "mentor",
-                    }
-                },
-                "candidate": {
-                    "value": {
-                        "email": "test@mephi.com",
-                        "phone": "+7 (999) 999-99-99",
-                        "gender": "М",
-                        "birthday": datetime.fromisoformat("2000-01-01").date(),
-                        "fio": "Егоров Алексей Мифи",
-                        "password": "test123456",
-                        "vk": "https://vk.com/alekseyegorov",
-                        "telegram": "https://t.me/ShadarRim",
-                        "role": "candidate",
-                    }
+        body_examples = {
+            "curator": {
+                "value": {
+                    "email": "test@mipt.ru",
+                    "phone": "+7 (999) 999-99-99",
+                    "gender": "М",
+                    "birthday": datetime.now().date(),
+                    "fio": "Сурначев Михаил Дмитриевич",
+                    "password": "test123456",
+                    "role": "curator",
+                }
+            },
+            "hr": {
+                "value": {
+                    "email": "test@misis.com",
+                    "phone": "+7 (999) 999-99-99",
+                    "gender": "М",
+                    "birthday": datetime.now().date(),
+                    "fio": "Куренков Владимир Вячеславович",
+                    "password": "test123456",
+                    "role": "hr",
                 },
-            }
+            },
+            "mentor": {
+                "value": {
+                    "email": "test@hse.com",
+                    "phone": "+7 (999) 999-99-99",
+                    "gender": "Ж",
+                    "birthday": datetime.now().date(),
+                    "fio": "Горденко Мария Константиновна",
+                    "password": "test123456",
+                    "role": "mentor",
+                }
+            },
+            "candidate": {
+                "value": {
+                    "email": "test@mephi.com",
+                    "phone": "+7 (999) 999-99-99",
+                    "gender": "М",
+                    "birthday": datetime.fromisoformat("2000-01-01").date(),
+                    "fio": "Егоров Алексей Мифи",
+                    "password": "test123456",
+                    "vk": "https://vk.com/alekseyegorov",
+                    "telegram": "https://t.me/ShadarRim",
+                    "role": "candidate",
+                }
+            },
         }
 
 
@@ -147,6 +143,26 @@ class TokenData(BaseModel):
     email: Optional[str] = None
 
 
+class UserImportRow(BaseModel):
+    fio: str = Field(..., min_length=1)
+    email: EmailStr
+    phone: Optional[str] = None
+    role: str = "mentor"
+
+
+class UserImportError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    detail: str
+
+
+class UserImportResult(BaseModel):
+    rows_total: int = 0
+    created: int = 0
+    existing: list[str] = []
+    errors: list[UserImportError] = []
+
+
 # endregion  User
 
 
@@ -261,15 +277,13 @@ class TagBase(BaseModel):
 
 class TagCreate(TagBase):
     class Config:
-        schema_extra = {
-            "examples": {
-                "example1": {
-                    "value": {"name": "Программист"},
-                },
-                "example2": {
-                    "value": {"name": "Математик"},
-                },
-            }
+        body_examples = {
+            "example1": {
+                "value": {"name": "Программист"},
+            },
+            "example2": {
+                "value": {"name": "Математик"},
+            },
         }
 
 
@@ -370,8 +384,8 @@ class VacancyCreate(VacancyBase):
                 "start_date": datetime(2023, 6, 15, 0, 0, 0),
                 "end_date": datetime(2023, 6, 30, 0, 0, 0),
                 "tags": [
-                    TagCreate.Config.schema_extra["examples"][i]["value"]
-                    for i in TagCreate.Config.schema_extra["examples"]
+                    example["value"]
+                    for example in TagCreate.Config.body_examples.values()
                 ],
                 "requirements": VacancyRequirementsSpecializations.Config.schmea_extra[
                     "example"
@@ -436,21 +450,19 @@ class VacancyFilters(VacancyFiltersBase):
     end_date: Optional[datetime | None]
 
     class Config:
-        schema_extra = {
-            "examples": {
-                "empty": {
-                    "value": {},
-                },
-                "full": {
-                    "value": {
-                        "tags": ["Стажер", "Шахтер"],
-                        "organisations": ["Ларек Деда"],
-                        "city": "Москва",
-                        "start_date": datetime(2023, 6, 15, 0, 0, 0),
-                        "end_date": datetime(2023, 6, 30, 0, 0, 0),
-                    },
+        body_examples = {
+            "empty": {
+                "value": {},
+            },
+            "full": {
+                "value": {
+                    "tags": ["Стажер", "Шахтер"],
+                    "organisations": ["Ларек Деда"],
+                    "city": "Москва",
+                    "start_date": datetime(2023, 6, 15, 0, 0, 0),
+                    "end_date": datetime(2023, 6, 30, 0, 0, 0),
                 },
-            }
+            },
         }
 
 
@@ -530,12 +542,66 @@ class EducationalTrack(BaseModel):
     required_pass_rate: float
 
 
+class EducationalTrackDto(EducationalTrack):
+    id: int
+    event_ids: list[int] = []
+
+    class Config:
+        orm_mode = True
+        schema_extra = {
+            "example": {
+                "id": 1,
+                "name": "Карьерная школа",
+                "required_pass_rate": 0.7,
+                "event_ids": [1, 2, 3],
+            }
+        }
+
+
+class TrackResult(BaseModel):
+    user_id: int
+    track_id: int
+    score: int
+    max_score: int
+    pass_rate: float
+    passed: bool
+
+    class Config:
+        orm_mode = True
+
+
 class StudentTrackInfo(BaseModel):
     fio: str
     course: str
     scores: list[int]
 
 
+class StudentMatch(BaseModel):
+    fio: str
+    matched_fio: Optional[str] = None
+    similarity: float = 0
+    suggestions: list[str] = []
+
+    class Config:
+        orm_mode = True
+
+
+class ScoreImportDiff(BaseModel):
+    rows_total: int = 0
+    rows_changed: int = 0
+    columns_total: int = 0
+    columns_changed: int = 0
+    events_created: int = 0
+    events_updated: int = 0
+    scores_created: int = 0
+    scores_updated: int = 0
+    scores_unchanged: int = 0
+    fuzzy_matched: list[StudentMatch] = []
+    unmatched: list[StudentMatch] = []
+    # строки, сопоставленные с уже загруженным в этом файле пользователем (пропущены)
+    duplicates: list[StudentMatch] = []
+
+
 class EventScore(BaseModel):
     user_id: int
     event_id: int
@@ -551,6 +617,36 @@ class CandidateActivity(BaseModel):
     max_score: int
 
 
+class CandidateRating(CandidateActivity):
+    fio: str
+    score_ratio: float
+    percentile: float
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "user_id": 1,
+                "fio": "Егоров Алексей Мифи",
+                "overall_score": 18,
+                "max_score": 20,
+                "score_ratio": 0.9,
+                "percentile": 97.5,
+            }
+        }
+
+
+class ScoreHistogramBin(BaseModel):
+    lower: float
+    upper: float
+    count: int
+
+
+class CandidatesLeaderboard(BaseModel):
+    total: int
+    candidates: list[CandidateRating]
+    histogram: list[ScoreHistogramBin]
+
+
 # endregion Event
 
 # region Mailing
@@ -1,8 +1,14 @@
-from fastapi import Cookie, HTTPException, status, Depends
+import math
+
+from fastapi import Cookie, HTTPException, Request, status, Depends
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.data.database import SessionLocal
-from app.service.auth import get_current_user
+from app.service.auth import get_current_user, get_token_subject
+from app.utils import rate_limit
 from app.utils.logging import log
+from app.utils.metrics import rate_limited_requests_total
+from app.utils.settings import settings
 from app.data import models
 
 
@@ -23,3 +29,40 @@ async def current_user(
             detail="Not authenticated (current_user)",
         )
     return await get_current_user(db, access_token)
+
+
+class RateLimit:
+    """
+    Ограничение частоты запросов к эндпоинту (token bucket)
+
+    Корзина своя у каждого пользователя из токена доступа (без обращения к БД),
+    для запросов без токена - у каждого ip. Когда корзина пуста, отвечает 429
+    с Retry-After, до загрузки пользователя и выполнения эндпоинта.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+
+    async def __call__(
+        self, request: Request, access_token: str | None = Cookie(None)
+    ) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        subject = get_token_subject(access_token) if access_token else None
+        if subject:
+            client = f"user:{subject}"
+        else:
+            client = f"ip:{request.client.host if request.client else 'unknown'}"
+        wait = await run_in_threadpool(
+            rate_limit.take, f"{self.name}:{client}", self.rate, self.burst
+        )
+        if wait:
+            rate_limited_requests_total.inc(self.name)
+            log.info("rate limit %s exceeded by %s", self.name, client)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
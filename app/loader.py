@@ -2,21 +2,38 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 
-from app.data import models
+from app.data import models, invalidation
 from app.data.database import engine
 from app.routers import router
-from app.service import mailing_service
-from app.data.openapi import get_openapi_schema
+from app.service import mailing_service, activity_export, user_import
+from app.utils import memory
+from app.data.openapi import setup_openapi
+from app.utils.serializer import JSONResponse
+from app.utils.compression import CompressionMiddleware
+from app.utils.metrics import MetricsMiddleware, metrics_endpoint
+from app.utils.query_stats import QueryStatsMiddleware
+from app.utils.profiling import ProfilingMiddleware
+from app.utils.settings import settings
 
 
 async def on_startup():
     models.Base.metadata.create_all(bind=engine)
     mailing_service.init_email_service()
+    invalidation.start_listener()
+    if settings.MEMORY_TRACING:
+        memory.start_tracing()
+
+
+async def on_shutdown():
+    invalidation.stop_listener()
+    activity_export.shutdown_executor()
+    user_import.shutdown_executor()
 
 
 def create_app():
-    app = FastAPI()
+    app = FastAPI(default_response_class=JSONResponse)
     app.add_event_handler("startup", on_startup)
+    app.add_event_handler("shutdown", on_shutdown)
     # Set all CORS enabled origins
     app.add_middleware(
         CORSMiddleware,
@@ -25,6 +42,16 @@ def create_app():
         allow_methods=["*"],
         allow_headers=["*"],
     )
-    app.openapi_schema = get_openapi_schema(app)
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+    app.add_middleware(ProfilingMiddleware)
+    app.add_middleware(QueryStatsMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
     app.include_router(router)
+    setup_openapi(app)
     return app
@@ -5,6 +5,9 @@ import app.routers.test as test
 import app.routers.vacancy as vacancy
 import app.routers.mailing as mailing
 import app.routers.activity as activity
+import app.routers.export as export
+import app.routers.profiling as profiling
+import app.routers.memory as memory
 from fastapi import APIRouter
 
 router = APIRouter(prefix="/api")
@@ -15,3 +18,6 @@ router.include_router(test.router)
 router.include_router(vacancy.router)
 router.include_router(mailing.router)
 router.include_router(activity.router)
+router.include_router(export.router)
+router.include_router(profiling.router)
+router.include_router(memory.router)
@@ -18,42 +18,57 @@ from fastapi import (
     Query,
     Path,
     Body,
+    Request,
 )
 
 from sqlalchemy.orm import Session
 from app.data import crud, models, schemas
-from app.data.constants import UserRole, MailingTemplate, MailingSubjects
+from app.data.constants import UserRole, MailingTemplate, MailingSubjects, EntityName
 from app.dependencies import get_db, current_user
 from app.service.auth import get_hashed_user
 from app.utils.logging import log
-from app.service import vacancy_service, mailing_service
+from app.utils.serializer import orm_list_response, orm_to_dict
+from app.utils.etag import make_etag, etag_matches, not_modified, cached_json_response
+from app.service import vacancy_service, mailing_service, track_service
 from app.utils.settings import settings
 
 
 router = APIRouter(prefix="/activity", tags=["activity"])
 
+events_cache_control = "private, max-age=60"
+
 
 @router.get("/events", response_model=list[schemas.EventDto] | None)
 async def get_events(
+    request: Request,
     db: Session = Depends(get_db),
     db_user: models.User = Depends(current_user),
     offset: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-) -> list[schemas.EventDto] | None:
+) -> Response:
     """
     Получение мероприятий по образовательному треку (для кандидата)
     """
     if db_user.role != UserRole.candidate:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
 
+    etag = make_etag(
+        "events", crud.get_entity_version(db, EntityName.events), offset, limit
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag, events_cache_control)
+
     db_events: list[models.Event] | None = crud.get_events(db, limit, offset)
     if db_events is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
-    return (
-        [schemas.EventDto.from_orm(db_event) for db_event in db_events]
+    return cached_json_response(
+        request,
+        [orm_to_dict(schemas.EventDto, db_event) for db_event in db_events]
         if db_events
-        else None
+        else None,
+        events_cache_control,
+        etag,
     )
 
 
@@ -63,7 +78,7 @@ async def get_events_scores(
     db_user: models.User = Depends(current_user),
     offset: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-) -> list[schemas.EventScore] | None:
+) -> Response:
     """
     Получение оценок по мероприятиям (для кандидата)
     """
@@ -74,14 +89,7 @@ async def get_events_scores(
     if db_events_scores is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
-    return (
-        [
-            schemas.EventScore.from_orm(db_event_score)
-            for db_event_score in db_events_scores
-        ]
-        if db_events_scores
-        else None
-    )
+    return orm_list_response(schemas.EventScore, db_events_scores)
 
 
 @router.get("/candidates/all", response_model=list[schemas.CandidateActivity] | None)
@@ -115,25 +123,150 @@ async def get_candidates_activity(
     )
 
 
-# @router.get("/cadidates/{candidate_id}", response_model=list[schemas.CandidateActivity] | None)
-# async def get_candidate_activity_by_id(
-#     candidate_id: int = Path(..., ge=1),
-#     db: Session = Depends(get_db),
-#     db_user: models.User = Depends(current_user),
-# ) -> list[schemas.CandidateActivity] | None:
-#     """
-#     Получение данных о конкретном кандидате (для куратора)
-#     """
-#     if db_user.role != UserRole.curator:
-#         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
-
-#     db_candidate_score = crud.get_candidate_score_by_id(db, candidate_id)
-#     if db_candidate_score is None:
-#         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
-
-#     return [
-#         schemas.CandidateActivity(**{
-#             "user_id": db_candidate_score[0],
-            
-#         }) for event in db_candidate_score
-#     ]
+@router.get("/candidates/top", response_model=schemas.CandidatesLeaderboard)
+async def get_candidates_leaderboard(
+    db: Session = Depends(get_db),
+    db_user: models.User = Depends(current_user),
+    k: int = Query(10, ge=1, le=1000),
+    bins: int = Query(10, ge=1, le=100),
+) -> schemas.CandidatesLeaderboard:
+    """
+    Рейтинг лучших кандидатов Карьерной школы по доле набранных баллов с перцентилем и гистограммой баллов (для куратора)
+    """
+    if db_user.role != UserRole.curator:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+    db_top = crud.get_candidates_top(db, k)
+    db_histogram = dict(crud.get_candidates_score_histogram(db, bins))
+
+    return schemas.CandidatesLeaderboard(
+        total=sum(db_histogram.values()),
+        candidates=[
+            schemas.CandidateRating(
+                user_id=user_id,
+                fio=fio,
+                overall_score=score,
+                max_score=max_score,
+                score_ratio=score / max_score if max_score else 0,
+                percentile=round(percentile * 100, 2),
+            )
+            for user_id, fio, score, max_score, percentile in db_top
+        ],
+        histogram=[
+            schemas.ScoreHistogramBin(
+                lower=(i - 1) / bins,
+                upper=i / bins,
+                count=db_histogram.get(i, 0),
+            )
+            for i in range(1, bins + 1)
+        ],
+    )
+
+
+@router.post("/candidates/refresh", status_code=status.HTTP_204_NO_CONTENT)
+async def refresh_candidates_activity(
+    db: Session = Depends(get_db),
+    db_user: models.User = Depends(current_user),
+):
+    """
+    Пересчет итоговых баллов кандидатов (для куратора)
+    """
+    if db_user.role != UserRole.curator:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+    crud.refresh_candidate_score_totals(db)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/candidates/{candidate_id}", response_model=schemas.CandidateActivity)
+async def get_candidate_activity_by_id(
+    candidate_id: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    db_user: models.User = Depends(current_user),
+) -> schemas.CandidateActivity:
+    """
+    Получение данных о конкретном кандидате (для куратора)
+    """
+    if db_user.role != UserRole.curator:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+    db_candidate_score = crud.get_candidate_score_by_id(db, candidate_id)
+    if db_candidate_score is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    return schemas.CandidateActivity(
+        **{
+            "user_id": db_candidate_score[0],
+            "overall_score": db_candidate_score[1],
+            "max_score": db_candidate_score[2],
+        }
+    )
+
+
+@router.get("/tracks", response_model=list[schemas.EducationalTrackDto])
+async def get_tracks(
+    db: Session = Depends(get_db),
+    db_user: models.User = Depends(current_user),
+) -> list[schemas.EducationalTrackDto]:
+    """
+    Получение образовательных треков и привязанных к ним мероприятий
+    """
+    db_tracks = crud.get_educational_tracks(db)
+    return [schemas.EducationalTrackDto.from_orm(db_track) for db_track in db_tracks]
+
+
+@router.put("/tracks/{track_id}/events", response_model=schemas.EducationalTrackDto)
+async def update_track_events(
+    event_ids: list[int],
+    track_id: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    db_user: models.User = Depends(current_user),
+) -> schemas.EducationalTrackDto:
+    """
+    Привязка мероприятий к образовательному треку с пересчетом результатов (для куратора)
+
+    Трек без привязанных мероприятий учитывает все мероприятия программы
+    """
+    if db_user.role != UserRole.curator:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+    try:
+        db_track = crud.update_educational_track_events(db, track_id, event_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    track_service.evaluate_tracks(db)
+    return schemas.EducationalTrackDto.from_orm(db_track)
+
+
+@router.get("/tracks/results", response_model=list[schemas.TrackResult] | None)
+async def get_tracks_results(
+    db: Session = Depends(get_db),
+    db_user: models.User = Depends(current_user),
+    track_id: int | None = Query(None, ge=1),
+    passed: bool | None = Query(None),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+) -> Response:
+    """
+    Получение результатов прохождения треков кандидатами (для куратора)
+    """
+    if db_user.role != UserRole.curator:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+    db_results = crud.get_track_results(db, limit, offset, track_id, passed)
+    return orm_list_response(schemas.TrackResult, db_results)
+
+
+@router.get("/tracks/my", response_model=list[schemas.TrackResult] | None)
+async def get_my_tracks_results(
+    db: Session = Depends(get_db),
+    db_user: models.User = Depends(current_user),
+) -> Response:
+    """
+    Получение результатов прохождения треков (для кандидата)
+    """
+    if db_user.role != UserRole.candidate:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+    db_results = crud.get_user_track_results(db, db_user)
+    return orm_list_response(schemas.TrackResult, db_results)
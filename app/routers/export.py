@@ -0,0 +1,76 @@
+import os
+from functools import partial
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse, FileResponse
+from starlette.background import BackgroundTask
+from app.data import crud, models
+from app.data.constants import UserRole, InternApplicationStatus, ExportFormat
+from app.dependencies import current_user
+from app.service.export_service import export_response
+from app.service.activity_export import export_activity_workbook
+from app.utils.memory import track_memory_peak
+
+router = APIRouter(
+    prefix="/export", tags=["export"], dependencies=[Depends(track_memory_peak)]
+)
+
+
+def curator(db_user: models.User = Depends(current_user)) -> models.User:
+    if db_user.role != UserRole.curator:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+    return db_user
+
+
+@router.get("/intern_applications", response_class=StreamingResponse)
+async def export_intern_applications(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    application_status: InternApplicationStatus | None = Query(None, alias="status"),
+    db_user: models.User = Depends(curator),
+) -> StreamingResponse:
+    """
+    Выгрузка всех заявок на стажировку с данными кандидатов в NDJSON или CSV (для куратора)
+    """
+    return export_response(
+        "intern_applications",
+        partial(crud.export_intern_applications, status=application_status),
+        export_format,
+    )
+
+
+@router.get("/candidates", response_class=StreamingResponse)
+async def export_candidates_scores(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    db_user: models.User = Depends(curator),
+) -> StreamingResponse:
+    """
+    Выгрузка баллов всех кандидатов по мероприятиям в NDJSON или CSV (для куратора)
+    """
+    return export_response("candidates", crud.export_candidates_scores, export_format)
+
+
+@router.get("/mailings", response_class=StreamingResponse)
+async def export_mailings(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    db_user: models.User = Depends(curator),
+) -> StreamingResponse:
+    """
+    Выгрузка истории рассылок в NDJSON или CSV (для куратора)
+    """
+    return export_response("mailings", crud.export_mailings, export_format)
+
+
+@router.get("/activity.xlsx", response_class=FileResponse)
+async def export_activity_xlsx(
+    db_user: models.User = Depends(curator),
+) -> FileResponse:
+    """
+    Выгрузка баллов кандидатов по мероприятиям в xlsx в формате "Программы развития" (для куратора)
+    """
+    path = await export_activity_workbook()
+    return FileResponse(
+        path,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename="Программа развития.xlsx",
+        background=BackgroundTask(os.remove, path),
+    )
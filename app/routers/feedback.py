@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 from app.data import crud, models, schemas
 from app.dependencies import get_db, current_user
 from app.utils.logging import log
+from app.utils.serializer import orm_list_response
 
 
 router = APIRouter(prefix="/feedback", tags=["feedback"])
@@ -24,7 +25,7 @@ async def get_feedbacks(
     offset: Annotated[int, Query(..., ge=0)] = 0,
     db: Session = Depends(get_db),
     db_user: models.User = Depends(current_user),
-) -> list[schemas.Feedback] | None:
+) -> Response:
     """
     Получения списка отзывов (для кандидата и наставника)
     """
@@ -38,11 +39,7 @@ async def get_feedbacks(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="No feedbacks found"
         )
-    return (
-        [schemas.Feedback.from_orm(db_feedback) for db_feedback in db_feedbacks]
-        if db_feedbacks
-        else None
-    )
+    return orm_list_response(schemas.Feedback, db_feedbacks)
 
 
 @router.post(
@@ -1,5 +1,14 @@
 import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+    Query,
+    Path,
+    Response,
+    Request,
+)
 from app.utils.country import get_country_code
 from sqlalchemy.orm import Session
 from app.data import crud, models, schemas
@@ -9,13 +18,26 @@ from app.data.constants import (
     InternApplicationParameters,
 )
 from app.dependencies import get_db, current_user
+from app.data.database import SessionLocal
 from app.utils.settings import settings
 from app.utils.logging import log
+from app.utils.serializer import orm_list_response, orm_to_dict
+from app.utils.etag import cached_json_response
+from app.utils.singleflight import SingleFlight
 from app.service.verify_intern_application import verify
 
 
 router = APIRouter(prefix="/intern_application", tags=["intern_application"])
 
+# одновременные запросы статистики по одному параметру выполняют один запрос к БД
+stats_flight = SingleFlight("intern_application_stats")
+
+
+def _get_stats(parameters: InternApplicationParameters) -> list:
+    # the result is shared by several requests, so it can't use a request's session
+    with SessionLocal() as db:
+        return crud.get_intern_application_stats(db, parameters)
+
 
 @router.post(
     "/my", response_model=schemas.InternApplication, status_code=status.HTTP_201_CREATED
@@ -39,10 +61,11 @@ async def create_application(
     return schemas.InternApplication.from_orm(db_application)
 
 
-@router.get("/my")
+@router.get("/my", response_model=schemas.InternApplication)
 async def get_application(
+    request: Request,
     db_user: models.User = Depends(current_user),
-):
+) -> Response:
     """
     Просмотр заполненной заявки (для кандидата)
     """
@@ -55,13 +78,16 @@ async def get_application(
             status_code=status.HTTP_404_NOT_FOUND, detail="Application not found"
         )
 
-    return schemas.InternApplication.from_orm(db_application)
+    return cached_json_response(
+        request,
+        orm_to_dict(schemas.InternApplication, db_application),
+        "private, no-cache",
+    )
 
 
 @router.get("/stats")
 async def get_stats(
     parameters: InternApplicationParameters = Query(...),
-    db: Session = Depends(get_db),
     db_user: models.User = Depends(current_user),
 ):  # -> dict[str, int]:
     """
@@ -70,7 +96,7 @@ async def get_stats(
     if not db_user.role == UserRole.curator:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
     try:
-        data = crud.get_intern_application_stats(db, parameters)
+        data = await stats_flight.do(parameters, _get_stats, parameters)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=e)
     return {x[0]: x[1] for x in data}
@@ -83,7 +109,7 @@ async def get_all_intern_applications(
     intern_application_status: InternApplicationStatus = InternApplicationStatus.verified,
     db: Session = Depends(get_db),
     db_user: models.User = Depends(current_user),
-) -> list[schemas.InternApplication] | None:
+) -> Response:
     """
     Получение списка заявок по статусу:
 
@@ -100,14 +126,7 @@ async def get_all_intern_applications(
     db_applications = crud.get_all_intern_applications(
         db, offset, limit, intern_application_status
     )
-    return (
-        [
-            schemas.InternApplication.from_orm(db_application)
-            for db_application in db_applications
-        ]
-        if db_applications
-        else None
-    )
+    return orm_list_response(schemas.InternApplication, db_applications)
 
 
 @router.get("/{id}", response_model=schemas.InternApplication | None)
@@ -119,7 +138,7 @@ async def get_intern_application_by_id(
     """
     Получение заявки по id (для куратора)
     """
-    log.debug(f"get_intern_application_by_id: {id} by {db_user}")
+    log.debug("get_intern_application_by_id: %s by %s", id, db_user)
     if not db_user.role == UserRole.curator.value:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
     try:
@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Query, Response
 from sqlalchemy.orm import Session
 from app.data import crud, models, schemas
 from app.data.constants import (
@@ -9,13 +9,20 @@ from app.data.constants import (
     MailingTemplate,
     MailingSubjects,
 )
-from app.dependencies import get_db, current_user
+from app.dependencies import get_db, current_user, RateLimit
 from app.service import mailing_service
 from app.utils.logging import log
+from app.utils.serializer import orm_list_response
+from app.utils.memory import track_memory_peak
+from app.utils.settings import settings
 
 
 router = APIRouter(prefix="/mailing", tags=["mailing"])
 
+mailing_rate_limit = RateLimit(
+    "mailing", settings.RATE_LIMIT_MAILING_RATE, settings.RATE_LIMIT_MAILING_BURST
+)
+
 
 @router.post("/links")
 async def create_mailing_links(
@@ -33,12 +40,16 @@ async def create_mailing_links(
     return [{"title": link.title, "link": link.link} for link in db_links]
 
 
-@router.post("/send/school_invite", response_model=list[schemas.Mailing] | None)
+@router.post(
+    "/send/school_invite",
+    response_model=list[schemas.Mailing] | None,
+    dependencies=[Depends(mailing_rate_limit), Depends(track_memory_peak)],
+)
 async def create_school_invite_mailing(
     school_link: str = Query("", min_length=1, max_length=255),
     db: Session = Depends(get_db),
     sender: models.User = Depends(current_user),
-) -> list[schemas.Mailing] | None:
+) -> Response:
     """
     Отправка приглашения в Карьерную школу по составленному списку кандидатов с одобренными заявками (для куратора)
     """
@@ -72,11 +83,7 @@ async def create_school_invite_mailing(
             mailing, MailingTemplate.school_invite, template_data
         )
 
-    return (
-        [schemas.Mailing.from_orm(mailing) for mailing in mailings]
-        if mailings
-        else None
-    )
+    return orm_list_response(schemas.Mailing, mailings)
 
 
 # @router.post("/send/{event_id}")
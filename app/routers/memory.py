@@ -0,0 +1,112 @@
+import tracemalloc
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from app.data import models
+from app.data.constants import UserRole
+from app.dependencies import current_user
+from app.utils import memory
+
+router = APIRouter(prefix="/memory", tags=["memory"])
+
+KEY_TYPE_PATTERN = "^(lineno|filename|traceback)$"
+
+
+def curator_with_tracing(
+    db_user: models.User = Depends(current_user),
+) -> models.User:
+    if db_user.role != UserRole.curator:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+    if not tracemalloc.is_tracing():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Memory tracing is disabled"
+        )
+    return db_user
+
+
+@router.post("/tracing")
+async def set_memory_tracing(
+    enabled: bool = Query(...),
+    db_user: models.User = Depends(current_user),
+) -> dict[str, bool | int]:
+    """
+    Включение и выключение отслеживания аллокаций tracemalloc в текущем воркере (для куратора)
+
+    Пока отслеживание включено, аллокации замедляются, снимки удаляются при выключении
+    """
+    if db_user.role != UserRole.curator:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+    if enabled:
+        memory.start_tracing()
+        return {"tracing": True, **memory.traced_memory()}
+    memory.stop_tracing()
+    return {"tracing": False}
+
+
+@router.get("/top")
+async def get_memory_top(
+    key_type: str = Query("lineno", regex=KEY_TYPE_PATTERN),
+    limit: int = Query(20, ge=1, le=200),
+    db_user: models.User = Depends(curator_with_tracing),
+) -> dict:
+    """
+    Места с наибольшим объемом живых аллокаций (для куратора)
+    """
+    snapshot = memory.current_snapshot()
+    return {
+        **memory.traced_memory(),
+        "top": memory.top_stats(snapshot, key_type, limit),
+    }
+
+
+@router.post("/snapshots")
+async def create_memory_snapshot(
+    key_type: str = Query("lineno", regex=KEY_TYPE_PATTERN),
+    limit: int = Query(20, ge=1, le=200),
+    db_user: models.User = Depends(curator_with_tracing),
+) -> dict:
+    """
+    Снимок аллокаций для последующего сравнения (для куратора)
+
+    Хранятся последние MEMORY_MAX_SNAPSHOTS снимков текущего воркера
+    """
+    snapshot_id, snapshot = memory.take_snapshot()
+    return {
+        "id": snapshot_id,
+        **memory.traced_memory(),
+        "top": memory.top_stats(snapshot, key_type, limit),
+    }
+
+
+@router.get("/snapshots")
+async def get_memory_snapshots(
+    db_user: models.User = Depends(curator_with_tracing),
+) -> list[int]:
+    """
+    Идентификаторы сохраненных снимков (для куратора)
+    """
+    return memory.snapshot_ids()
+
+
+@router.get("/diff")
+async def get_memory_diff(
+    from_id: int = Query(...),
+    to_id: int | None = Query(None, description="по умолчанию - текущее состояние"),
+    key_type: str = Query("lineno", regex=KEY_TYPE_PATTERN),
+    limit: int = Query(20, ge=1, le=200),
+    db_user: models.User = Depends(curator_with_tracing),
+) -> dict:
+    """
+    Разница аллокаций между снимками, отсортированная по приросту (для куратора)
+    """
+    old = memory.get_snapshot(from_id)
+    # the current state is not stored, it would evict the saved snapshots
+    new = memory.get_snapshot(to_id) if to_id is not None else memory.current_snapshot()
+    if old is None or new is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Snapshot not found"
+        )
+    return {
+        **memory.traced_memory(),
+        "diff": memory.diff_stats(new, old, key_type, limit),
+    }
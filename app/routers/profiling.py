@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
+from fastapi.responses import FileResponse
+from app.data import models
+from app.data.constants import UserRole
+from app.dependencies import current_user
+from app.utils.profiling import (
+    PROFILE_HEADER,
+    list_reports,
+    profile_signature,
+    report_path,
+)
+
+router = APIRouter(prefix="/profiling", tags=["profiling"])
+
+
+@router.get("/")
+async def get_profile_reports(
+    db_user: models.User = Depends(current_user),
+) -> list[dict[str, str | int | float]]:
+    """
+    Список сохраненных отчетов профилирования запросов, новые первыми (для куратора)
+    """
+    if db_user.role != UserRole.curator:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+    return [
+        {"name": report.name, "size": report.size, "created": report.created}
+        for report in list_reports()
+    ]
+
+
+@router.get("/signature")
+async def get_profile_signature(
+    path: str = Query(..., min_length=1, example="/api/vacancy/"),
+    db_user: models.User = Depends(current_user),
+) -> dict[str, str]:
+    """
+    Заголовок для профилирования запроса по пути (для куратора)
+
+    Запрос с этим заголовком будет выполнен под профилировщиком, отчет появится в списке отчетов.
+    Заголовок действует PROFILING_SIGNATURE_TTL секунд (до expires)
+    """
+    if db_user.role != UserRole.curator:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+    value = profile_signature(path)
+    return {
+        "header": PROFILE_HEADER,
+        "value": value,
+        "expires": value.partition(".")[0],
+    }
+
+
+@router.get("/{name}", response_class=FileResponse)
+async def get_profile_report(
+    name: str = Path(...),
+    db_user: models.User = Depends(current_user),
+) -> FileResponse:
+    """
+    Скачивание отчета профилирования (для куратора)
+    """
+    if db_user.role != UserRole.curator:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+    path = report_path(name)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Report not found"
+        )
+    media_type = "text/html" if name.endswith(".html") else None
+    return FileResponse(path, media_type=media_type, filename=name)
@@ -13,15 +13,23 @@ from fastapi import (
 from sqlalchemy.orm import Session
 from app.data import crud, models, schemas
 
-from app.dependencies import current_user, get_db
+from app.dependencies import current_user, get_db, RateLimit
 from app.utils.settings import settings
 from app.utils.logging import log
 from app.data.constants import UserRole
 from app.utils.education_course import process_file
+from app.service import track_service
+from app.utils.memory import track_memory_peak
 
 
 router = APIRouter(prefix="/test", tags=["test"])
 
+upload_rate_limit = RateLimit(
+    "score_upload",
+    settings.RATE_LIMIT_SCORE_UPLOAD_RATE,
+    settings.RATE_LIMIT_SCORE_UPLOAD_BURST,
+)
+
 
 @router.get("/")
 async def change_role(
@@ -36,7 +44,11 @@ async def change_role(
 
 
 # endpoint for testing uploading excel file
-@router.post("/upload")
+@router.post(
+    "/upload",
+    response_model=schemas.ScoreImportDiff,
+    dependencies=[Depends(upload_rate_limit), Depends(track_memory_peak)],
+)
 async def upload_file(
     db: Session = Depends(get_db),
     db_user: models.User = Depends(current_user),
@@ -44,6 +56,8 @@ async def upload_file(
 ):
     """
     Загрузка данных о прохождении Карьерной школы кандидатами с оценками из мероприятий из excel-файла
+
+    Повторная загрузка записывает только изменившиеся оценки и возвращает сводку изменений
     """
 
     with open("static/test.xlsx", "wb") as f:
@@ -51,8 +65,10 @@ async def upload_file(
 
     tracks, students, edu_events = process_file("static/test.xlsx")
     try:
-        crud.create_students_events_scores(db, students, edu_events)
+        diff = crud.create_students_events_scores(db, students, edu_events)
+        crud.upsert_educational_tracks(db, tracks)
+        track_service.evaluate_tracks(db)
     except Exception as e:
         log.error(e)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return diff
@@ -8,17 +8,32 @@ from fastapi import (
     Request,
     Body,
     HTTPException,
+    UploadFile,
+    File,
+    BackgroundTasks,
 )
 from sqlalchemy.orm import Session
 from app.data import crud, models, schemas
-from app.dependencies import get_db, current_user
-from app.service import auth
+from app.dependencies import get_db, current_user, RateLimit
+from app.service import auth, mailing_service, user_import
+from app.data.constants import UserRole, MailingTemplate, MailingSubjects
 from app.utils.settings import settings
 from app.utils.logging import log
+from app.utils.serializer import orm_to_dict
+from app.utils.etag import cached_json_response
+from app.utils.memory import track_memory_peak
 
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# каждый вход и регистрация вычисляют bcrypt хеш
+login_rate_limit = RateLimit(
+    "login", settings.RATE_LIMIT_LOGIN_RATE, settings.RATE_LIMIT_LOGIN_BURST
+)
+signup_rate_limit = RateLimit(
+    "signup", settings.RATE_LIMIT_SIGNUP_RATE, settings.RATE_LIMIT_SIGNUP_BURST
+)
+
 """
 post create_user
 post login
@@ -49,16 +64,16 @@ refresh_cookie_params = {
 
 @router.post(
     "/",
-    openapi_extra=schemas.UserCreate.Config.schema_extra,
     response_model=schemas.User,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(signup_rate_limit)],
 )
 async def create_user(
     request: Request,  # TODO: add middleware to write last ip address
     response: Response,
     user_data: Annotated[
         schemas.UserCreate,
-        Body(..., examples=schemas.UserCreate.Config.schema_extra["examples"]),
+        Body(..., examples=schemas.UserCreate.Config.body_examples),
     ],
     db: Annotated[Session, None] = Depends(get_db),
 ) -> schemas.User:
@@ -75,12 +90,16 @@ async def create_user(
     return schemas.User.from_orm(db_user)
 
 
-@router.post("/login", response_model=schemas.User)
+@router.post(
+    "/login",
+    response_model=schemas.User,
+    dependencies=[Depends(login_rate_limit)],
+)
 async def login(
     response: Response,
     user_data: Annotated[
         schemas.UserLogin,
-        Body(..., examples=schemas.UserLogin.Config.schema_extra["examples"]),
+        Body(..., examples=schemas.UserLogin.Config.body_examples),
     ],
     db: Annotated[Session, None] = Depends(get_db),
 ) -> schemas.User:
@@ -129,13 +148,16 @@ async def logout(
 
 @router.get("/", response_model=schemas.User)
 async def get_user(
+    request: Request,
     db_user: models.User = Depends(current_user),
-) -> schemas.User:
+) -> Response:
     """
     Получение данных пользователя
     """
     log.debug(db_user)
-    return schemas.User.from_orm(db_user)
+    return cached_json_response(
+        request, orm_to_dict(schemas.User, db_user), "private, no-cache"
+    )
 
 
 @router.put("/", response_model=schemas.User)
@@ -149,3 +171,42 @@ async def update_user(
     db_user = crud.update_user(db, user_data)
 
     return schemas.User.from_orm(db_user)
+
+
+@router.post(
+    "/import",
+    response_model=schemas.UserImportResult,
+    dependencies=[Depends(track_memory_peak)],
+)
+async def import_users(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    db_user: models.User = Depends(current_user),
+) -> schemas.UserImportResult:
+    """
+    Массовое создание аккаунтов из csv или xlsx файла (HR - наставники, куратор - наставники, кандидаты и стажеры)
+
+    Столбцы: ФИО, Почта, Телефон (необязательно), Роль (по умолчанию mentor).
+    Уже зарегистрированные почты пропускаются, созданным пользователям письма
+    с данными для входа отправляются в фоне после ответа
+    """
+    if db_user.role not in (UserRole.hr, UserRole.curator):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+    content = await file.read()
+    try:
+        result, messages = await user_import.import_users(
+            db, db_user, content, file.filename or ""
+        )
+    except user_import.ImportFileError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if messages:
+        background_tasks.add_task(
+            mailing_service.send_bulk,
+            MailingTemplate.single_credentials,
+            MailingSubjects.single_credentials.value,
+            messages,
+        )
+    return result
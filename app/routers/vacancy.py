@@ -1,5 +1,3 @@
-import string
-import random
 from typing import Annotated
 from fastapi import (
     APIRouter,
@@ -10,20 +8,26 @@ from fastapi import (
     Query,
     Path,
     Body,
+    Request,
 )
 
 from sqlalchemy.orm import Session
 from app.data import crud, models, schemas
-from app.data.constants import UserRole, MailingTemplate, MailingSubjects
+from app.data.constants import UserRole, MailingTemplate, MailingSubjects, EntityName
 from app.dependencies import get_db, current_user
-from app.service.auth import get_hashed_user
+from app.service.auth import get_hashed_user, generate_password
 from app.utils.logging import log
+from app.utils.serializer import orm_list_response
+from app.utils.etag import make_etag, etag_matches, not_modified, cached_json_response
 from app.service import vacancy_service, mailing_service
 from app.utils.settings import settings
 
 
 router = APIRouter(prefix="/vacancy", tags=["vacancy"])
 
+# фильтры меняются только вместе с вакансиями, браузер может не перепроверять их минуту
+filters_cache_control = "private, max-age=60"
+
 
 @router.post("/create", response_model=schemas.VacancyDto)
 async def create_vacancy(
@@ -43,26 +47,40 @@ async def create_vacancy(
 
 @router.get("/filters", response_model=schemas.VacancyFiltersAvailable)
 async def get_vacancy_filters(
+    request: Request,
     db: Session = Depends(get_db),
     db_user: models.User = Depends(current_user),
-) -> schemas.VacancyFiltersAvailable:
+) -> Response:
     """
     Получение доступных фильтров для вакансий
+
+    ETag строится по версии вакансий, при совпадении If-None-Match фильтры не пересчитываются
     """
-    return vacancy_service.get_all_filters(db)
+    version = crud.get_entity_version(db, EntityName.vacancies)
+    etag = make_etag("vacancy_filters", version)
+    if etag_matches(request, etag):
+        return not_modified(etag, filters_cache_control)
+
+    filters = await vacancy_service.get_all_filters_coalesced(version)
+    return cached_json_response(
+        request,
+        filters,
+        filters_cache_control,
+        etag,
+    )
 
 
 @router.post("/", response_model=list[schemas.VacancyDto] | None)
 async def get_vacancies(
     filters: Annotated[
         schemas.VacancyFilters,
-        Body(..., examples=schemas.VacancyFilters.Config.schema_extra["examples"]),
+        Body(..., examples=schemas.VacancyFilters.Config.body_examples),
     ],
     db: Session = Depends(get_db),
     db_user: models.User = Depends(current_user),
     offset: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-) -> list[schemas.VacancyDto] | None:
+) -> Response:
     """
     Получение списка вакансий по фильтрам (для кандидата, ментора, HR, куратора)
 
@@ -73,25 +91,10 @@ async def get_vacancies(
 
     """
 
-    vacancy_status: list[str] = []
-    if db_user.role == UserRole.candidate:
-        vacancy_status = ["published"]
-    elif db_user.role == UserRole.mentor:
-        vacancy_status = ["accepted", "published"]
-    elif db_user.role == UserRole.hr:
-        vacancy_status = ["accepted", "published", "pending", "hidden"]
-    elif db_user.role == UserRole.curator:
-        vacancy_status = ["accepted", "published", "pending", "hidden", "closed"]
-
-    db_vacancies = crud.get_vacancies(
-        db, db_user, filters, offset, limit, vacancy_status
-    )
-    log.debug(f"db_vacancies: {db_vacancies}")
-    return (
-        [schemas.VacancyDto.from_orm(vacancy) for vacancy in db_vacancies]
-        if db_vacancies
-        else None
+    content = vacancy_service.get_vacancies_response(
+        db, db_user, filters, offset, limit
     )
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/mentors", response_model=list[schemas.User] | None)
@@ -100,7 +103,7 @@ async def get_available_mentors(
     limit: int = Query(10, ge=1, le=100),
     db: Session = Depends(get_db),
     db_user: models.User = Depends(current_user),
-) -> list[schemas.User] | None:
+) -> Response:
     """
     Получение списка доступных менторов (для HR)
     """
@@ -108,7 +111,7 @@ async def get_available_mentors(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
 
     db_mentors = crud.get_users_available_mentors(db, offset, limit)
-    return [schemas.User.from_orm(i) for i in db_mentors] if db_mentors else None
+    return orm_list_response(schemas.User, db_mentors)
 
 
 @router.post("/mentor/apply/{vacancy_id}")
@@ -144,7 +147,7 @@ async def create_mentor(
     """
     if db_user.role != UserRole.hr:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
-    password = "".join(random.choice(string.ascii_lowercase) for i in range(16))
+    password = generate_password()
     mentor: schemas.UserCreate = schemas.UserCreate(
         **mentor_data.dict(), password=password
     )
@@ -174,14 +177,12 @@ async def get_offers(
     limit: int = Query(10, ge=1, le=100),
     db: Session = Depends(get_db),
     db_user: models.User = Depends(current_user),
-) -> list[schemas.MentorOfferDto] | None:
+) -> Response:
     """
     Получение списка заявлений для начала работы (для ментора)
     """
     db_offers = crud.get_offers(db, db_user, limit, offset)
-    return (
-        [schemas.MentorOfferDto.from_orm(i) for i in db_offers] if db_offers else None
-    )
+    return orm_list_response(schemas.MentorOfferDto, db_offers)
 
 
 @router.post("/mentor/offers/accept")
@@ -193,8 +194,8 @@ async def accept_vacancy_offer(
     """
     Принятие заявки на стажировку для метора и фиксация его на вакансии (для ментора)
     """
-    log.debug(f"user: {db_user}")
-    log.debug(f"mentor_vacancies: {db_user.mentor_vacancies}")
+    log.debug("user: %s", db_user)
+    log.debug("mentor_vacancies: %s", db_user.mentor_vacancies)
     if db_user.mentor_vacancies:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -0,0 +1,109 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+
+from app.data import crud
+from app.data.database import SessionLocal
+from app.utils.logging import log
+from app.utils.settings import settings
+
+# заголовок первого столбца листа "Программа развития (инфо)", по нему лист читается при загрузке
+TRACKS_HEADER = "Прохождение программы развития стажеров явялется обязательной частью для получения сертификата об окончании стажировки в Правительстве Москвы."
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def write_activity_workbook() -> str:
+    """
+    Запись баллов кандидатов в xlsx файл в формате "Программы развития"
+
+    Выполняется в отдельном процессе: строки читаются из БД частями и сразу
+    пишутся в write-only книгу, поэтому матрица баллов целиком в памяти не хранится.
+    Файл можно загрузить обратно через /test/upload.
+
+    Returns:
+        str: путь к временному файлу
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+
+    with SessionLocal() as db:
+        db_events = crud.get_export_events(db)
+        columns = {event.id: i for i, event in enumerate(db_events)}
+        max_score = sum(event.max_score for event in db_events)
+
+        tracks_sheet = workbook.create_sheet("Программа развития (инфо)")
+        tracks_sheet.append([TRACKS_HEADER, None, None])
+        tracks_sheet.append(["Трек", "Проходной балл", "Мероприятия"])
+        for track in crud.get_educational_tracks(db):
+            tracks_sheet.append(
+                [
+                    track.name,
+                    track.required_pass_rate,
+                    ", ".join(event.title for event in track.events),
+                ]
+            )
+
+        sheet = workbook.create_sheet("Программа развития")
+        summary = ["Сумма баллов", "Максимум", "Процент"]
+        sheet.append(
+            ["Дата", None, *(event.start_date for event in db_events), *summary]
+        )
+        sheet.append(["Мероприятие", None, *(event.title for event in db_events)])
+        sheet.append(
+            ["Максимальный балл", None, *(event.max_score for event in db_events)]
+        )
+        sheet.append(["ФИО", "Курс"])
+
+        rows = crud.export_activity_scores(db, settings.EXPORT_BATCH_SIZE)
+        students = 0
+        for _, scores in groupby(rows, key=lambda row: row["user_id"]):
+            scores = list(scores)
+            row = [0] * len(db_events)
+            for score in scores:
+                row[columns[score["event_id"]]] = score["score"]
+            total = sum(row)
+            sheet.append(
+                [
+                    scores[0]["fio"],
+                    scores[0]["course"],
+                    *row,
+                    total,
+                    max_score,
+                    round(total / max_score, 4) if max_score else 0,
+                ]
+            )
+            students += 1
+
+    workbook.save(path)
+    log.info("activity workbook: %s students x %s events", students, len(db_events))
+    return path
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: the worker must not inherit the connection pool of the API process
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.EXPORT_XLSX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+async def export_activity_workbook() -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), write_activity_workbook)
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
@@ -1,4 +1,6 @@
-from datetime import timedelta, datetime
+import secrets
+import string
+from datetime import date, timedelta, datetime
 
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi import HTTPException, Depends, status
@@ -6,13 +8,16 @@ from fastapi.param_functions import Form
 
 from pydantic.dataclasses import dataclass
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
 
 
-from app.data import models, crud, schemas
+from app.data import models, crud, schemas, invalidation
+from app.data.constants import CachedEntity
+from app.utils.cache import Cache
 from app.utils.logging import log
 
 from app.utils.settings import settings
@@ -20,6 +25,15 @@ from app.utils.settings import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# строки пользователей по id ("id:1") и id по почте из токена ("email:a@b.ru")
+users_cache = Cache("users", ttl=settings.USER_CACHE_TTL)
+# the password hash is not cached, it is loaded from the database on access
+_user_columns = {
+    column.key: column.type.python_type
+    for column in models.User.__table__.columns
+    if column.key != "hashed_password"
+}
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -30,6 +44,12 @@ def get_password_hash(password: str) -> str:
     return hashed_password
 
 
+def generate_password(length: int = 16) -> str:
+    """Случайный пароль для аккаунтов, создаваемых HR или куратором"""
+    alphabet = string.ascii_lowercase + string.digits
+    return "".join(secrets.choice(alphabet) for _ in range(length))
+
+
 def get_hashed_user(user: schemas.UserCreate) -> schemas.UserCreateHashed:
     """Хеширование пароля пользователя"""
     hashed_password = get_password_hash(user.password)
@@ -90,6 +110,17 @@ class AdditionalLoginFormData:
     stay_loggedin: bool = Form(None)
 
 
+def get_token_subject(token: str) -> str | None:
+    """Почта из токена доступа без обращения к БД, None для недействительного токена"""
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+
 async def get_current_user(db: Session, cookie_token: str) -> models.User:
     """ "Получение текущего пользователя"""
     credentials_exception = HTTPException(
@@ -103,17 +134,63 @@ async def get_current_user(db: Session, cookie_token: str) -> models.User:
         )
         email: str = payload.get("sub")  # type: ignore
         if email is None:
-            log.debug(f"email is None")
+            log.debug("email is None")
             raise credentials_exception
         token_data = schemas.TokenData(email=email)
     except JWTError as e:
-        log.debug(f"JWTError: {e}")
+        log.debug("JWTError: %s", e)
         raise credentials_exception
     if not token_data.email:
-        log.debug(f"token_data.email is None")
+        log.debug("token_data.email is None")
         raise credentials_exception
-    user = crud.get_user_by_email(db, token_data.email)
+    # the cache (redis) and the database are blocking, keep them off the event loop
+    user = await run_in_threadpool(get_user_by_email_cached, db, token_data.email)
     if user is None:
-        log.debug(f"User no found")
+        log.debug("User no found")
         raise credentials_exception
     return user
+
+
+def _user_to_cache(db_user: models.User) -> dict:
+    return {key: getattr(db_user, key) for key in _user_columns}
+
+
+def _user_from_cache(db: Session, data: dict) -> models.User:
+    values = {}
+    for key, python_type in _user_columns.items():
+        value = data.get(key)
+        if isinstance(value, str) and python_type in (date, datetime):
+            value = python_type.fromisoformat(value)
+        values[key] = value
+    db_user = models.User(**values)
+    # attach as an already loaded row: no SELECT, relationships load lazily as usual
+    make_transient_to_detached(db_user)
+    return db.merge(db_user, load=False)
+
+
+def get_user_by_email_cached(db: Session, email: str) -> models.User | None:
+    """
+    Пользователь по почте через общий кэш (до USER_CACHE_TTL секунд)
+
+    Запись по id удаляется invalidate_user при изменении пользователя во всех воркерах
+    (app.data.invalidation), соответствие почты id проверяется по почте в записи
+    """
+    user_id = users_cache.get(f"email:{email}")
+    if user_id is not None:
+        data = users_cache.get(f"id:{user_id}")
+        if data is not None and data["email"] == email:
+            return _user_from_cache(db, data)
+
+    db_user = crud.get_user_by_email(db, email)
+    if db_user is not None:
+        users_cache.set(f"email:{email}", db_user.id)
+        users_cache.set(f"id:{db_user.id}", _user_to_cache(db_user))
+    return db_user
+
+
+@invalidation.on_change(CachedEntity.users)
+def invalidate_user(user_id: int | None) -> None:
+    if user_id is None:
+        users_cache.clear()
+    else:
+        users_cache.delete(f"id:{user_id}")
@@ -0,0 +1,92 @@
+import csv
+import io
+from typing import Callable, Iterator
+
+import orjson
+from fastapi.responses import StreamingResponse
+from sqlalchemy.engine import MappingResult
+from sqlalchemy.orm import Session
+
+from app.data.constants import ExportFormat
+from app.data.database import SessionLocal
+from app.utils.logging import log
+from app.utils.settings import settings
+
+# размер части ответа, отправляемой клиенту
+CHUNK_SIZE = 64 * 1024
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+def _ndjson_chunks(rows: MappingResult) -> Iterator[bytes]:
+    chunk: list[bytes] = []
+    size = 0
+    for row in rows:
+        line = orjson.dumps(dict(row), option=orjson.OPT_APPEND_NEWLINE)
+        chunk.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield b"".join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield b"".join(chunk)
+
+
+def _csv_chunks(rows: MappingResult) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM нужен, чтобы Excel открыл кириллицу в UTF-8
+    buffer.write("\ufeff")
+    writer.writerow(rows.keys())
+    for row in rows:
+        writer.writerow(row.values())
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _stream_rows(
+    name: str,
+    query: Callable[[Session, int], MappingResult],
+    export_format: ExportFormat,
+) -> Iterator[bytes]:
+    # the stream outlives the endpoint, so it opens its own session instead of the request one
+    with SessionLocal() as db:
+        rows = query(db, settings.EXPORT_BATCH_SIZE)
+        if export_format == ExportFormat.csv:
+            yield from _csv_chunks(rows)
+        else:
+            yield from _ndjson_chunks(rows)
+        log.info("export %s finished", name)
+
+
+def export_response(
+    name: str,
+    query: Callable[[Session, int], MappingResult],
+    export_format: ExportFormat,
+) -> StreamingResponse:
+    """
+    Потоковая выгрузка строк запроса в NDJSON или CSV
+
+    Строки читаются из серверного курсора частями по EXPORT_BATCH_SIZE,
+    поэтому память не зависит от размера выгрузки
+
+    Args:
+        name (str): имя файла выгрузки без расширения
+        query (Callable[[Session, int], MappingResult]): функция выборки из crud,
+            принимает сессию и размер части
+        export_format (ExportFormat): формат выгрузки
+    """
+    return StreamingResponse(
+        _stream_rows(name, query, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{export_format.value}"'
+        },
+    )
@@ -23,7 +23,7 @@ def init_email_service() -> smtplib.SMTP:
     try:
         server.login(settings.SERVICE_MAIL_USER, settings.SERVICE_MAIL_PASSWORD)
     except Exception as e:
-        log.error(f"Can't connect to mail server: {e}")
+        log.error("Can't connect to mail server: %s", e)
         raise e
     finally:
         log.info("Connected to mail server")
@@ -75,10 +75,64 @@ def send_mailing(mailing: models.Mailing, template: MailingTemplate, template_da
             settings.SERVICE_MAIL_USER, mailing.target.email, msg.as_string()
         )
     except Exception as e:
-        log.error(f"Can't send email: {e}")
+        log.error("Can't send email: %s", e)
         raise e
 
 
+def send_bulk(
+    template: MailingTemplate,
+    subject: str,
+    messages: list[tuple[str, dict[str, Any]]],
+) -> int:
+    """
+    Отправка писем по одному шаблону списку адресатов через отдельное SMTP соединение
+
+    Выполняется в фоне после ответа в пуле потоков, поэтому не использует общее
+    соединение send_mailing (smtplib не потокобезопасен). Ошибка отправки одного
+    письма записывается в лог и не прерывает остальные
+
+    Args:
+        messages: почта адресата и данные шаблона
+
+    Returns:
+        int: количество отправленных писем
+    """
+    global TEMPLATES
+    if not TEMPLATES:
+        TEMPLATES = jinja2.Environment(loader=jinja2.FileSystemLoader("app/templates"))
+    html_template = TEMPLATES.get_template(f"{template.value}.html")
+
+    server = init_email_service()
+    sent = 0
+    try:
+        for to, template_data in messages:
+            msg = MIMEText(html_template.render(**template_data), "html")
+            msg["To"] = to
+            msg["Subject"] = subject
+            for attempt in range(2):
+                try:
+                    server.sendmail(settings.SERVICE_MAIL_USER, to, msg.as_string())
+                    sent += 1
+                    break
+                except smtplib.SMTPServerDisconnected:
+                    # long batches outlive the server idle timeout, reconnect once
+                    if attempt == 0:
+                        server.close()
+                        server = init_email_service()
+                    else:
+                        log.error("Can't send email to %s: server disconnected", to)
+                except Exception as e:
+                    log.error("Can't send email to %s: %s", to, e)
+                    break
+    finally:
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+    log.info("%s: sent %s of %s emails", template.value, sent, len(messages))
+    return sent
+
+
 # def create_mailing(
 #     targets: list[models.User], template: MailingTemplate
 # ) -> None:
@@ -0,0 +1,81 @@
+from sqlalchemy.orm import Session
+
+from app.data import crud
+from app.utils.logging import log
+
+
+def evaluate_tracks(db: Session) -> int:
+    """Расчет прохождения всех образовательных треков всеми кандидатами
+
+    Строится матрица оценок пользователь x мероприятие и матрица
+    принадлежности мероприятий трекам, после чего доля набранных баллов
+    по каждому треку считается одним матричным умножением.
+    Трек без привязанных мероприятий учитывает все мероприятия программы.
+
+    Returns:
+        int: количество сохраненных результатов
+    """
+    import numpy as np
+
+    db_tracks = crud.get_educational_tracks(db)
+    db_events = crud.get_events_max_scores(db)
+    db_scores = crud.get_all_events_scores(db)
+    if not db_tracks or not db_events or not db_scores:
+        crud.replace_track_results(db, [])
+        return 0
+
+    event_ids = np.array([event_id for event_id, _ in db_events])
+    max_scores = np.array([max_score for _, max_score in db_events], dtype=np.int64)
+    track_ids = np.array([track.id for track in db_tracks])
+    # в таблице проходной балл может быть указан в процентах
+    pass_rates = np.array(
+        [
+            track.required_pass_rate / 100
+            if track.required_pass_rate > 1
+            else track.required_pass_rate
+            for track in db_tracks
+        ]
+    )
+
+    scores = np.array(db_scores, dtype=np.int64)
+    user_ids, user_index = np.unique(scores[:, 0], return_inverse=True)
+    event_index = np.searchsorted(event_ids, scores[:, 1])
+    score_matrix = np.zeros((len(user_ids), len(event_ids)), dtype=np.int64)
+    np.add.at(score_matrix, (user_index, event_index), scores[:, 2])
+
+    track_matrix = np.zeros((len(track_ids), len(event_ids)), dtype=np.int64)
+    track_events = crud.get_events_tracks(db)
+    if track_events:
+        pairs = np.array(track_events)
+        track_matrix[
+            np.searchsorted(track_ids, pairs[:, 0]),
+            np.searchsorted(event_ids, pairs[:, 1]),
+        ] = 1
+    track_matrix[~track_matrix.any(axis=1)] = 1
+
+    track_scores = score_matrix @ track_matrix.T
+    track_max_scores = track_matrix @ max_scores
+    track_rates = np.divide(
+        track_scores,
+        track_max_scores,
+        out=np.zeros(track_scores.shape),
+        where=track_max_scores > 0,
+    )
+    passed = track_rates >= pass_rates
+
+    results = [
+        {
+            "user_id": int(user_ids[i]),
+            "track_id": int(track_ids[j]),
+            "score": int(track_scores[i, j]),
+            "max_score": int(track_max_scores[j]),
+            "pass_rate": float(track_rates[i, j]),
+            "passed": bool(passed[i, j]),
+        }
+        for i in range(len(user_ids))
+        for j in range(len(track_ids))
+    ]
+    crud.replace_track_results(db, results)
+
+    log.debug("track results evaluated: %s", len(results))
+    return len(results)
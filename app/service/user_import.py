@@ -0,0 +1,232 @@
+import asyncio
+import csv
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.data import crud, models, schemas
+from app.data.constants import MailingSubjects, UserRole
+from app.service.auth import generate_password, get_password_hash
+from app.utils.logging import log
+from app.utils.settings import settings
+
+# заголовки столбцов файла импорта (регистр не учитывается)
+IMPORT_COLUMNS = {
+    "фио": "fio",
+    "fio": "fio",
+    "почта": "email",
+    "email": "email",
+    "телефон": "phone",
+    "phone": "phone",
+    "роль": "role",
+    "role": "role",
+}
+
+# роли, которые может создавать импортирующий пользователь
+IMPORT_ROLES = {
+    UserRole.hr: {UserRole.mentor},
+    UserRole.curator: {UserRole.mentor, UserRole.candidate, UserRole.intern},
+}
+
+_executor: ProcessPoolExecutor | None = None
+
+
+class ImportFileError(ValueError):
+    pass
+
+
+def read_rows(content: bytes, filename: str) -> Iterator[list[Any]]:
+    """Строки первого листа xlsx или csv файла (разделитель определяется автоматически)"""
+    if filename.lower().endswith(".xlsx"):
+        from openpyxl import load_workbook
+
+        try:
+            workbook = load_workbook(
+                io.BytesIO(content), read_only=True, data_only=True
+            )
+        except Exception as e:
+            raise ImportFileError(f"Can't read xlsx file: {e}")
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+        workbook.close()
+        return
+
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ImportFileError("CSV file must be UTF-8 encoded")
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    yield from csv.reader(io.StringIO(text), dialect)
+
+
+def parse_rows(
+    rows: Iterator[list[Any]], allowed_roles: set[UserRole]
+) -> tuple[list[tuple[int, schemas.UserImportRow]], list[schemas.UserImportError]]:
+    """
+    Проверка строк файла импорта
+
+    Returns:
+        tuple: корректные строки с номерами и ошибки (повторы почты в файле тоже ошибка)
+    """
+    header = next(rows, None)
+    if header is None:
+        raise ImportFileError("File is empty")
+    columns = {
+        i: IMPORT_COLUMNS[str(name).strip().lower()]
+        for i, name in enumerate(header)
+        if name is not None and str(name).strip().lower() in IMPORT_COLUMNS
+    }
+    if not {"fio", "email"} <= set(columns.values()):
+        raise ImportFileError("File must have fio and email columns")
+
+    valid: list[tuple[int, schemas.UserImportRow]] = []
+    errors: list[schemas.UserImportError] = []
+    emails: set[str] = set()
+    for number, row in enumerate(rows, start=2):
+        data = {
+            field: str(row[i]).strip()
+            for i, field in columns.items()
+            if i < len(row) and row[i] is not None and str(row[i]).strip()
+        }
+        if not data:
+            continue
+        if number - 1 > settings.USER_IMPORT_MAX_ROWS:
+            raise ImportFileError(
+                f"File has more than {settings.USER_IMPORT_MAX_ROWS} rows"
+            )
+        email = data.get("email")
+        try:
+            user = schemas.UserImportRow(**data)
+        except ValidationError as e:
+            detail = "; ".join(f"{err['loc'][0]}: {err['msg']}" for err in e.errors())
+            errors.append(
+                schemas.UserImportError(row=number, email=email, detail=detail)
+            )
+            continue
+        user.email = user.email.lower()
+        if user.role not in {role.value for role in allowed_roles}:
+            errors.append(
+                schemas.UserImportError(
+                    row=number, email=email, detail=f"Role {user.role} is not allowed"
+                )
+            )
+        elif user.email in emails:
+            errors.append(
+                schemas.UserImportError(
+                    row=number, email=email, detail="Duplicate email in file"
+                )
+            )
+        else:
+            emails.add(user.email)
+            valid.append((number, user))
+    return valid, errors
+
+
+def _hash_passwords(passwords: list[str]) -> list[str]:
+    return [get_password_hash(password) for password in passwords]
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: the worker must not inherit the connection pool of the API process
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.USER_IMPORT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+async def hash_passwords(passwords: list[str]) -> list[str]:
+    """
+    Хеширование паролей bcrypt в пуле процессов
+
+    Пароли делятся на части по числу процессов, чтобы не передавать их по одному
+    """
+    if not passwords:
+        return []
+    loop = asyncio.get_running_loop()
+    size = -(-len(passwords) // (settings.USER_IMPORT_WORKERS * 4))
+    chunks = [passwords[i : i + size] for i in range(0, len(passwords), size)]
+    hashed = await asyncio.gather(
+        *(
+            loop.run_in_executor(_get_executor(), _hash_passwords, chunk)
+            for chunk in chunks
+        )
+    )
+    return [password for chunk in hashed for password in chunk]
+
+
+async def import_users(
+    db: Session, importer: models.User, content: bytes, filename: str
+) -> tuple[schemas.UserImportResult, list[tuple[str, dict[str, Any]]]]:
+    """
+    Импорт пользователей из csv/xlsx файла со столбцами ФИО, Почта, Телефон, Роль
+
+    Пользователи с уже зарегистрированной почтой пропускаются, остальным
+    генерируется пароль и записывается рассылка с данными для входа
+
+    Returns:
+        tuple: сводка импорта и письма с данными для входа (почта, данные шаблона)
+    """
+    allowed_roles = IMPORT_ROLES[UserRole(importer.role)]
+    valid, errors = parse_rows(read_rows(content, filename), allowed_roles)
+    result = schemas.UserImportResult(
+        rows_total=len(valid) + len(errors), errors=errors
+    )
+
+    existing = crud.get_existing_emails(db, [user.email for _, user in valid])
+    new_users = [user for _, user in valid if user.email not in existing]
+
+    passwords = [generate_password() for _ in new_users]
+    hashed_passwords = await hash_passwords(passwords)
+    created = crud.create_users_bulk(
+        db,
+        [
+            schemas.UserCreateHashed(**user.dict(), hashed_password=hashed_password)
+            for user, hashed_password in zip(new_users, hashed_passwords)
+        ],
+        importer,
+        MailingSubjects.single_credentials.value,
+    )
+    result.created = len(created)
+
+    created_emails = {email for _, email in created}
+    # emails registered concurrently are skipped by the insert
+    existing |= {user.email for user in new_users} - created_emails
+    result.existing = sorted(existing)
+    messages = [
+        (
+            user.email,
+            {
+                "fio": user.fio,
+                "login": user.email,
+                "password": password,
+                "domain": f"{settings.DOMAIN}/login",
+            },
+        )
+        for user, password in zip(new_users, passwords)
+        if user.email in created_emails
+    ]
+    log.info(
+        "user import by %s: %s rows, %s created, %s existing, %s errors",
+        importer.email,
+        result.rows_total,
+        result.created,
+        len(result.existing),
+        len(result.errors),
+    )
+    return result, messages
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
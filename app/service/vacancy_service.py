@@ -1,9 +1,23 @@
 from sqlalchemy.orm import Session
 
-from app.data import crud, schemas, models
+from app.data import crud, schemas, models, invalidation
+from app.data.database import SessionLocal
+from app.data.constants import UserRole, EntityName, CachedEntity
+from app.utils.cache import Cache, LRUCache
+from app.utils.serializer import dumps, orm_to_dict
+from app.utils.settings import settings
+from app.utils.singleflight import SingleFlight
 
+# ответы со списком вакансий, общие для всех пользователей одной роли
+vacancies_cache = LRUCache(
+    maxsize=settings.VACANCY_CACHE_SIZE, ttl=settings.VACANCY_CACHE_TTL
+)
+filters_cache = Cache("vacancy_filters", ttl=settings.FILTERS_CACHE_TTL)
+# одновременные запросы фильтров одной версии вычисляются один раз в воркере
+filters_flight = SingleFlight("vacancy_filters")
 
-def get_all_filters(db: Session) -> schemas.VacancyFiltersAvailable:
+
+def build_filters(db: Session) -> schemas.VacancyFiltersAvailable:
     # get all tags
 
     # get schemas from tags
@@ -22,3 +36,110 @@ def get_all_filters(db: Session) -> schemas.VacancyFiltersAvailable:
         city=cities,
         organisations=organisations,
     )
+
+
+def get_all_filters(
+    db: Session, version: int | None = None
+) -> schemas.VacancyFiltersAvailable:
+    """
+    Доступные фильтры вакансий из общего кэша
+
+    Ключ - версия вакансий, после изменения вакансии фильтры пересчитываются
+    """
+    if version is None:
+        version = crud.get_entity_version(db, EntityName.vacancies)
+    data = filters_cache.get_or_set(str(version), lambda: build_filters(db).dict())
+    return schemas.VacancyFiltersAvailable(**data)
+
+
+async def get_all_filters_coalesced(version: int) -> schemas.VacancyFiltersAvailable:
+    """
+    Доступные фильтры вакансий, одновременные запросы одной версии вычисляются один раз
+    """
+    return await filters_flight.do(version, _get_all_filters, version)
+
+
+def _get_all_filters(version: int) -> schemas.VacancyFiltersAvailable:
+    # the result is shared by several requests, so it can't use a request's session
+    with SessionLocal() as db:
+        return get_all_filters(db, version)
+
+
+def get_vacancies_status(role: str) -> list[str]:
+    """
+    Статусы вакансий, которые видит пользователь с ролью
+
+    для кандидата - только опубликованные
+    для ментора - опубликованные и принятые
+    для HR - опубликованные, принятые и ожидающие (созданные HR)
+    для куратора - опубликованные, принятые, ожидающие, скрытые и закрытые
+    """
+    if role == UserRole.candidate:
+        return ["published"]
+    elif role == UserRole.mentor:
+        return ["accepted", "published"]
+    elif role == UserRole.hr:
+        return ["accepted", "published", "pending", "hidden"]
+    elif role == UserRole.curator:
+        return ["accepted", "published", "pending", "hidden", "closed"]
+    return []
+
+
+def _filters_key(filters: schemas.VacancyFilters) -> tuple:
+    # city is matched with ilike, so its case does not change the result, but an
+    # empty city (matches everything) and a missing one are different queries;
+    # an empty tag list behaves the same as a missing one
+    return (
+        tuple(sorted(set(filters.tags or []))),
+        tuple(sorted(set(filters.organisations or []))),
+        filters.city.casefold() if filters.city is not None else None,
+        filters.start_date,
+        filters.end_date,
+    )
+
+
+def get_vacancies_response(
+    db: Session,
+    db_user: models.User,
+    filters: schemas.VacancyFilters,
+    offset: int,
+    limit: int,
+) -> bytes:
+    """
+    Сериализованный список вакансий по фильтрам
+
+    Ответ зависит только от роли, фильтров и страницы, поэтому кэшируется
+    (кроме HR, которому видны только свои вакансии). Ключ содержит версию
+    вакансий, изменение вакансии в любом воркере делает старые записи недоступными.
+    """
+    vacancy_status = get_vacancies_status(db_user.role)
+    key = None
+    if db_user.role != UserRole.hr:
+        key = (
+            tuple(vacancy_status),
+            _filters_key(filters),
+            offset,
+            limit,
+            crud.get_entity_version(db, EntityName.vacancies),
+        )
+        body = vacancies_cache.get(key)
+        if body is not None:
+            return body
+
+    db_vacancies = crud.get_vacancies(
+        db, db_user, filters, offset, limit, vacancy_status
+    )
+    body = dumps(
+        [orm_to_dict(schemas.VacancyDto, vacancy) for vacancy in db_vacancies]
+        if db_vacancies
+        else None
+    )
+    if key is not None:
+        vacancies_cache.set(key, body)
+    return body
+
+
+@invalidation.on_change(CachedEntity.vacancies)
+def invalidate_vacancies_cache(vacancy_id: int | None = None) -> None:
+    # cached pages are keyed by filters, any vacancy may be on any of them
+    vacancies_cache.clear()
@@ -1,4 +1,5 @@
 import datetime
+import logging
 from app.data import schemas
 from app.data import models
 from app.utils.logging import log
@@ -16,7 +17,7 @@ def verify(
     Returns:
         schemas.InternApplication: _description_
     """
-    log.debug(f"intern_application: {intern_application}")
+    log.debug("intern_application: %s", intern_application)
     verification = (
         (intern_application.citizenship == "RU")
         and (18 <= datetime.datetime.now().year - db_user.birthday.year <= 35)
@@ -24,14 +25,17 @@ def verify(
             intern_application.graduation_date.year - datetime.datetime.now().year <= 1
         )
     )
-    log.debug(f"ctizenship: {intern_application.citizenship == 'RU'}")
-    log.debug(
-        f"age: {18 <= datetime.datetime.now().year - db_user.birthday.year <= 35}"
-    )
-    log.debug(
-        f"graduation: {intern_application.graduation_date.year - datetime.datetime.now().year <= 1}"
-    )
-    log.debug(verification)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("ctizenship: %s", intern_application.citizenship == "RU")
+        log.debug(
+            "age: %s",
+            18 <= datetime.datetime.now().year - db_user.birthday.year <= 35,
+        )
+        log.debug(
+            "graduation: %s",
+            intern_application.graduation_date.year - datetime.datetime.now().year <= 1,
+        )
+    log.debug("verification: %s", verification)
 
     intern_application.status = "verified" if verification else "unverified"
     return intern_application
@@ -0,0 +1,251 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import orjson
+
+from app.utils.logging import log
+from app.utils.metrics import cache_errors_total, cache_requests_total
+from app.utils.settings import settings
+
+
+class LRUCache:
+    """
+    Потокобезопасный LRU кэш в памяти процесса с временем жизни записей
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        with self._lock:
+            self._set(key, value, ttl)
+
+    def add(self, key: Hashable, value: Any, ttl: float | None = None) -> bool:
+        """Запись, только если ключа нет (или он истек)"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] >= time.monotonic():
+                return False
+            self._set(key, value, ttl)
+            return True
+
+    def _set(self, key: Hashable, value: Any, ttl: float | None) -> None:
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._data if str(k).startswith(prefix)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class MemoryBackend:
+    """Кэш в памяти процесса, у каждого воркера свой"""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int):
+        self._cache = LRUCache(maxsize)
+
+    def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._cache.set(key, value, ttl)
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return self._cache.add(key, value, ttl)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._cache.delete(key)
+
+    def delete_prefix(self, prefix: str) -> None:
+        self._cache.delete_prefix(prefix)
+
+
+class RedisBackend:
+    """
+    Кэш в Redis (или совместимом сервере), общий для всех воркеров
+
+    Ошибки соединения не прерывают запрос: чтение считается промахом, запись пропускается.
+    После ошибки redis не используется CACHE_REDIS_RETRY секунд
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        import redis  # optional dependency, only needed with CACHE_BACKEND=redis
+
+        self._errors = (redis.RedisError, OSError)
+        self._client = redis.Redis.from_url(
+            url, socket_timeout=0.5, socket_connect_timeout=0.5
+        )
+        self._retry_at = 0.0
+
+    def _call(self, operation: str, default: Any, fn: Callable[[], Any]) -> Any:
+        # a dead server would cost the connect timeout on every call, skip it for a while
+        if time.monotonic() < self._retry_at:
+            return default
+        try:
+            return fn()
+        except self._errors as e:
+            self._retry_at = time.monotonic() + settings.CACHE_REDIS_RETRY
+            cache_errors_total.inc(self.name)
+            log.warning("redis cache %s failed: %s", operation, e)
+            return default
+
+    def get(self, key: str) -> bytes | None:
+        return self._call("get", None, lambda: self._client.get(key))
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        px = max(int(ttl * 1000), 1)
+        self._call("set", None, lambda: self._client.set(key, value, px=px))
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        px = max(int(ttl * 1000), 1)
+        return bool(
+            self._call(
+                "add", True, lambda: self._client.set(key, value, px=px, nx=True)
+            )
+        )
+
+    def delete(self, *keys: str) -> None:
+        self._call("delete", None, lambda: self._client.delete(*keys))
+
+    def delete_prefix(self, prefix: str) -> None:
+        def delete_prefix() -> None:
+            keys = list(self._client.scan_iter(match=f"{prefix}*", count=1000))
+            for start in range(0, len(keys), 1000):
+                self._client.unlink(*keys[start : start + 1000])
+
+        self._call("delete_prefix", None, delete_prefix)
+
+
+_backend: MemoryBackend | RedisBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> MemoryBackend | RedisBackend:
+    """Бэкенд кэша по CACHE_BACKEND, создается при первом обращении"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if settings.CACHE_BACKEND == "redis":
+                _backend = RedisBackend(settings.CACHE_REDIS_URL)
+            else:
+                _backend = MemoryBackend(settings.CACHE_MEMORY_SIZE)
+        return _backend
+
+
+class Cache:
+    """
+    Кэш JSON-сериализуемых значений в отдельном пространстве имен
+
+    Запись хранится TTL секунд и еще CACHE_STALE_TTL секунд как устаревшая. get_or_set
+    пересчитывает значение только в одном вызове (блокировка в бэкенде, с redis - одна
+    на все воркеры): остальные получают устаревшее значение без ожидания, а если записи
+    нет - ждут результат до CACHE_LOCK_TIMEOUT секунд. get устаревшие записи не отдает.
+    """
+
+    def __init__(self, namespace: str, ttl: float):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.prefix = f"{settings.CACHE_PREFIX}:{namespace}:"
+
+    @property
+    def backend(self) -> MemoryBackend | RedisBackend:
+        return get_backend()
+
+    def _read(self, key: str) -> tuple[bool, Any] | None:
+        raw = self.backend.get(self.prefix + key)
+        if raw is None:
+            return None
+        item = orjson.loads(raw)
+        return item["expires"] >= time.time(), item["value"]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        item = self._read(key)
+        if item is None or not item[0]:
+            cache_requests_total.inc(self.namespace, "miss")
+            return default
+        cache_requests_total.inc(self.namespace, "hit")
+        return item[1]
+
+    def set(self, key: str, value: Any) -> None:
+        item = orjson.dumps({"expires": time.time() + self.ttl, "value": value})
+        self.backend.set(self.prefix + key, item, self.ttl + settings.CACHE_STALE_TTL)
+
+    def get_or_set(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Значение из кэша или результат compute(), None не кэшируется
+        """
+        item = self._read(key)
+        if item is not None and item[0]:
+            cache_requests_total.inc(self.namespace, "hit")
+            return item[1]
+        lock = f"{self.prefix}{key}:lock"
+        if self.backend.add(lock, b"1", settings.CACHE_LOCK_TIMEOUT):
+            try:
+                return self._compute(key, compute)
+            finally:
+                self.backend.delete(lock)
+        # another call is already computing the value
+        if item is not None:
+            cache_requests_total.inc(self.namespace, "stale")
+            return item[1]
+        deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            item = self._read(key)
+            if item is not None:
+                cache_requests_total.inc(self.namespace, "waited")
+                return item[1]
+            if self.backend.get(lock) is None:
+                # the other call failed or got None, which is not cached
+                break
+        return self._compute(key, compute)
+
+    def _compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        cache_requests_total.inc(self.namespace, "miss")
+        value = compute()
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def delete(self, *keys: str) -> None:
+        self.backend.delete(*(self.prefix + key for key in keys))
+
+    def clear(self) -> None:
+        self.backend.delete_prefix(self.prefix)
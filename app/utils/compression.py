@@ -0,0 +1,179 @@
+import zlib
+from typing import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is used without it
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Выбор кодирования ответа по заголовку Accept-Encoding с учетом q-значений
+
+    При равном приоритете предпочитается br (если установлен brotli), затем gzip
+    """
+    available = ["br", "gzip"] if brotli is not None else ["gzip"]
+    weights: dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0
+        weights[name.strip()] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Сжатие очередной части тела с принудительной отправкой накопленных данных"""
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """
+    Сжатие ответов gzip/brotli по Accept-Encoding клиента
+
+    Сжимаются только текстовые типы (json, ndjson, text) размером от minimum_size,
+    потоковые ответы сжимаются по частям без буферизации всего тела.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            encoding = negotiate_encoding(headers.get("accept-encoding", ""))
+            if encoding is not None:
+                responder = CompressionResponder(
+                    self.app,
+                    self.minimum_size,
+                    lambda: Compressor(encoding, self.gzip_level, self.brotli_quality),
+                )
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class CompressionResponder:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        compressor_factory: Callable[[], Compressor],
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        # compressor state is allocated only for responses that are actually compressed
+        self.compressor_factory = compressor_factory
+        self.compressor: Compressor
+        self.send: Send
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    def _set_headers(self, content_length: int | None) -> None:
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        headers["Content-Encoding"] = self.compressor.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        # strong validator no longer matches the encoded representation
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+    async def send_compressed(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # headers are sent together with the first part of the body
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            return
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.started:
+            self.started = True
+            if self.passthrough or (len(body) < self.minimum_size and not more_body):
+                self.passthrough = True
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+            self.compressor = self.compressor_factory()
+            if more_body:
+                self._set_headers(None)
+                message["body"] = self.compressor.compress(body)
+            else:
+                message["body"] = self.compressor.finish(body)
+                self._set_headers(len(message["body"]))
+            await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        if not self.passthrough:
+            if more_body:
+                message["body"] = self.compressor.compress(body)
+            else:
+                message["body"] = self.compressor.finish(body)
+        await self.send(message)
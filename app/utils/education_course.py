@@ -1,4 +1,3 @@
-import pandas as pd
 from pydantic import BaseModel
 import datetime
 from app.data import schemas
@@ -8,6 +7,9 @@ from app.data import schemas
 
 
 def process_file(file_name: str):
+    # pandas is only needed for uploads, importing it here keeps it out of worker startup
+    import pandas as pd
+
     df = pd.read_excel(file_name, sheet_name="Программа развития (инфо)")
     df = df.iloc[1:]
     # drop 3 column
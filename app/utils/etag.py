@@ -0,0 +1,58 @@
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+
+from app.utils.serializer import dumps
+
+
+def make_etag(*parts: Any) -> str:
+    """Сильный ETag по версии данных и параметрам запроса"""
+    return f'"{hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()}"'
+
+
+def content_etag(body: bytes) -> str:
+    """Сильный ETag по содержимому ответа"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Проверка If-None-Match (слабое сравнение, т.к. сжатый ответ получает W/ ETag)
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def cached_json_response(
+    request: Request,
+    content: Any,
+    cache_control: str,
+    etag: str | None = None,
+) -> Response:
+    """
+    JSON ответ с ETag и Cache-Control, 304 если клиент уже получил это содержимое
+
+    Если etag не передан, он считается по сериализованному телу ответа
+    """
+    body = dumps(content)
+    etag = etag or content_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
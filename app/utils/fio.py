@@ -0,0 +1,114 @@
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+_separators = re.compile(r"[\s.,]+")
+
+
+def normalize_fio(fio: str) -> str:
+    """Нормализация ФИО для сравнения: регистр, ё -> е, точки и лишние пробелы"""
+    return _separators.sub(" ", fio.casefold().replace("ё", "е")).strip()
+
+
+def initials_key(normalized_fio: str) -> str | None:
+    """
+    Фамилия с инициалами: "иванов иван иванович" и "иванов и и" -> "иванов и и"
+    """
+    parts = normalized_fio.split(" ")
+    if len(parts) < 2:
+        return None
+    return " ".join([parts[0], *(part[0] for part in parts[1:])])
+
+
+def trigrams(normalized_fio: str) -> set[str]:
+    """Триграммы слов как в pg_trgm: слово дополняется двумя пробелами слева и одним справа"""
+    result = set()
+    for word in normalized_fio.split(" "):
+        padded = f"  {word} "
+        result.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+@dataclass
+class FioMatch:
+    fio: str
+    user_id: int | None = None
+    matched_fio: str | None = None
+    # exact, initials, fuzzy или None если пользователь не найден
+    method: str | None = None
+    similarity: float = 0
+    suggestions: list[str] = field(default_factory=list)
+
+
+class FioIndex:
+    """
+    Индекс пользователей по нормализованному ФИО для сопоставления студентов при загрузке оценок
+
+    Строится один раз на загрузку из пар (id, fio). Поиск идет по точному совпадению,
+    затем по фамилии с инициалами, затем по похожести триграмм.
+    """
+
+    def __init__(self, users: list[tuple[int, str]], threshold: float = 0.7):
+        self.threshold = threshold
+        self._names: dict[str, list[tuple[int, str]]] = defaultdict(list)
+        self._initials: dict[str, list[tuple[int, str]]] = defaultdict(list)
+        self._trigrams: dict[str, set[str]] = defaultdict(set)
+        self._name_trigrams: dict[str, set[str]] = {}
+
+        for user_id, fio in users:
+            if not fio:
+                continue
+            name = normalize_fio(fio)
+            self._names[name].append((user_id, fio))
+            key = initials_key(name)
+            if key:
+                self._initials[key].append((user_id, fio))
+            if name not in self._name_trigrams:
+                self._name_trigrams[name] = trigrams(name)
+                for trigram in self._name_trigrams[name]:
+                    self._trigrams[trigram].add(name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def match(self, fio: str) -> FioMatch:
+        name = normalize_fio(fio)
+
+        users = self._names.get(name, [])
+        if len(users) == 1:
+            user_id, matched_fio = users[0]
+            return FioMatch(fio, user_id, matched_fio, "exact", 1)
+
+        key = initials_key(name)
+        users = self._initials.get(key, []) if key else []
+        if len(users) == 1:
+            user_id, matched_fio = users[0]
+            return FioMatch(fio, user_id, matched_fio, "initials", 1)
+
+        similar = self.similar(name)
+        suggestions = [self._names[i][0][1] for i, _ in similar[:3]]
+        if similar and similar[0][1] >= self.threshold:
+            best, similarity = similar[0]
+            # совпадение должно быть однозначным
+            if len(self._names[best]) == 1 and (
+                len(similar) == 1 or similar[1][1] < similarity
+            ):
+                user_id, matched_fio = self._names[best][0]
+                return FioMatch(
+                    fio, user_id, matched_fio, "fuzzy", similarity, suggestions
+                )
+
+        return FioMatch(fio, suggestions=suggestions)
+
+    def similar(self, normalized_fio: str) -> list[tuple[str, float]]:
+        """Похожие имена из индекса по коэффициенту Жаккара триграмм, по убыванию"""
+        query = trigrams(normalized_fio)
+        shared: dict[str, int] = defaultdict(int)
+        for trigram in query:
+            for name in self._trigrams.get(trigram, ()):
+                shared[name] += 1
+        result = [
+            (name, count / (len(query) + len(self._name_trigrams[name]) - count))
+            for name, count in shared.items()
+        ]
+        return sorted(result, key=lambda i: i[1], reverse=True)
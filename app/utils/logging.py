@@ -1,4 +1,8 @@
+import atexit
 import logging  # Logging important events
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
 from app.utils.settings import settings
 
 # region Logging
@@ -11,17 +15,32 @@ formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(messag
 ch = logging.StreamHandler()
 ch.setLevel(logging.DEBUG)
 ch.setFormatter(formatter)
-log.addHandler(ch)
 
 
-# Create file logging handler and set its level
-if settings.DOCKER_MODE:
-    logfile_path = r"/data/backend.log"
-else:
-    logfile_path = r"backend.log"
-fh = logging.FileHandler(logfile_path)
-fh.setFormatter(formatter)
-log.addHandler(fh)
+handlers: list[logging.Handler] = [ch]
+
+# Create rotating file logging handler, rotation is only safe with a single process
+if settings.LOG_TO_FILE:
+    if settings.DOCKER_MODE:
+        logfile_path = r"/data/backend.log"
+    else:
+        logfile_path = r"backend.log"
+    fh = RotatingFileHandler(
+        logfile_path,
+        maxBytes=settings.LOG_FILE_MAX_BYTES,
+        backupCount=settings.LOG_FILE_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+    fh.setFormatter(formatter)
+    handlers.append(fh)
+
+# The logger only puts records into a queue, console and file writes
+# happen in the listener thread and do not block the event loop
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+log.addHandler(QueueHandler(log_queue))
+listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+listener.start()
+atexit.register(listener.stop)
 
 # Set logging level
 logging_level_lower = settings.LOGGING_LEVEL.lower()
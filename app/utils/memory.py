@@ -0,0 +1,126 @@
+import threading
+import tracemalloc
+from collections import OrderedDict
+
+from fastapi import Request
+
+from app.utils.logging import log
+from app.utils.metrics import request_memory_peak_bytes
+from app.utils.settings import settings
+
+# служебные аллокации не показываются в статистике
+_filters = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+_snapshots: OrderedDict[int, tracemalloc.Snapshot] = OrderedDict()
+_snapshots_lock = threading.Lock()
+_next_snapshot_id = 1
+
+
+def start_tracing() -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(settings.MEMORY_TRACE_FRAMES)
+        log.info("memory tracing started")
+
+
+def stop_tracing() -> None:
+    with _snapshots_lock:
+        _snapshots.clear()
+    tracemalloc.stop()
+    log.info("memory tracing stopped")
+
+
+def traced_memory() -> dict[str, int]:
+    current, peak = tracemalloc.get_traced_memory()
+    return {"current": current, "peak": peak}
+
+
+def current_snapshot() -> tracemalloc.Snapshot:
+    """Снимок аллокаций без сохранения (для разовых сравнений)"""
+    return tracemalloc.take_snapshot().filter_traces(_filters)
+
+
+def take_snapshot() -> tuple[int, tracemalloc.Snapshot]:
+    """Снимок аллокаций, хранится MEMORY_MAX_SNAPSHOTS последних снимков"""
+    global _next_snapshot_id
+    snapshot = current_snapshot()
+    with _snapshots_lock:
+        snapshot_id = _next_snapshot_id
+        _next_snapshot_id += 1
+        _snapshots[snapshot_id] = snapshot
+        while len(_snapshots) > settings.MEMORY_MAX_SNAPSHOTS:
+            _snapshots.popitem(last=False)
+    return snapshot_id, snapshot
+
+
+def get_snapshot(snapshot_id: int) -> tracemalloc.Snapshot | None:
+    with _snapshots_lock:
+        return _snapshots.get(snapshot_id)
+
+
+def snapshot_ids() -> list[int]:
+    with _snapshots_lock:
+        return list(_snapshots)
+
+
+def top_stats(
+    snapshot: tracemalloc.Snapshot, key_type: str, limit: int
+) -> list[dict[str, str | int]]:
+    return [
+        {"site": _site(stat.traceback), "size": stat.size, "count": stat.count}
+        for stat in snapshot.statistics(key_type)[:limit]
+    ]
+
+
+def diff_stats(
+    new: tracemalloc.Snapshot,
+    old: tracemalloc.Snapshot,
+    key_type: str,
+    limit: int,
+) -> list[dict[str, str | int]]:
+    return [
+        {
+            "site": _site(stat.traceback),
+            "size": stat.size,
+            "size_diff": stat.size_diff,
+            "count": stat.count,
+            "count_diff": stat.count_diff,
+        }
+        for stat in new.compare_to(old, key_type)[:limit]
+    ]
+
+
+def _site(traceback: tracemalloc.Traceback) -> str:
+    # the most recent frame goes first
+    return " <- ".join(f"{frame.filename}:{frame.lineno}" for frame in traceback)
+
+
+async def track_memory_peak(request: Request):
+    """
+    Пиковый прирост памяти за запрос для тяжелых эндпоинтов (при включенном tracemalloc)
+
+    Зависимость с yield завершается после отправки ответа, поэтому учитываются
+    и потоковые ответы. Пик общий для процесса: параллельные запросы попадают в замер.
+    """
+    if not tracemalloc.is_tracing():
+        yield
+        return
+
+    start, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    try:
+        yield
+    finally:
+        if tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            route = getattr(request.scope.get("route"), "path", request.url.path)
+            request_memory_peak_bytes.observe(max(peak - start, 0), route)
+            log.info(
+                "memory peak %s %s: %.1f MiB",
+                request.method,
+                route,
+                (peak - start) / 2**20,
+            )
@@ -0,0 +1,247 @@
+import bisect
+import functools
+import threading
+import time
+from typing import Any, Callable
+
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], **extra: str) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # counts per bucket (not cumulative, the last one is +Inf), sum of values
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            item = self._values.get(labels)
+            if item is None:
+                item = ([0] * (len(self.buckets) + 1), [0.0])
+                self._values[labels] = item
+            item[0][index] += 1
+            item[1][0] += value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            items = sorted(
+                (labels, list(counts), total[0])
+                for labels, (counts, total) in self._values.items()
+            )
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = _labels(self.labelnames, labels, le=str(bound))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            label_str = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {total}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+http_requests_total = Counter(
+    "http_requests_total",
+    "Количество HTTP запросов",
+    ("method", "route", "status"),
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP запроса до отправки последней части ответа",
+    ("method", "route"),
+)
+crud_call_duration_seconds = Histogram(
+    "crud_call_duration_seconds",
+    "Время выполнения функций app.data.crud",
+    ("function",),
+    FAST_BUCKETS,
+)
+request_memory_peak_bytes = Histogram(
+    "request_memory_peak_bytes",
+    "Пиковый прирост памяти за запрос по tracemalloc (для тяжелых эндпоинтов)",
+    ("route",),
+    tuple(2**20 * size for size in (1, 4, 16, 64, 256, 1024)),
+)
+cache_requests_total = Counter(
+    "cache_requests_total",
+    "Обращения к кэшу по пространству имен и результату (hit, stale, waited, miss)",
+    ("namespace", "result"),
+)
+cache_errors_total = Counter(
+    "cache_errors_total",
+    "Ошибки бэкенда кэша, обращение считается промахом",
+    ("backend",),
+)
+cache_invalidations_total = Counter(
+    "cache_invalidations_total",
+    "Сбросы кэшей по сущности и источнику (local - своя транзакция, notify - другой"
+    " воркер, reconnect - полный сброс после переподключения слушателя)",
+    ("entity", "source"),
+)
+singleflight_calls_total = Counter(
+    "singleflight_calls_total",
+    "Вызовы объединяемых вычислений: executed - выполненные, coalesced - получившие"
+    " результат уже выполнявшегося вызова",
+    ("name", "result"),
+)
+rate_limited_requests_total = Counter(
+    "rate_limited_requests_total",
+    "Запросы, отклоненные ограничением частоты (429)",
+    ("limit",),
+)
+rate_limit_errors_total = Counter(
+    "rate_limit_errors_total",
+    "Ошибки хранилища ограничения частоты, запрос пропускается",
+    ("backend",),
+)
+REGISTRY = [
+    http_requests_total,
+    http_request_duration_seconds,
+    crud_call_duration_seconds,
+    request_memory_peak_bytes,
+    cache_requests_total,
+    cache_errors_total,
+    cache_invalidations_total,
+    singleflight_calls_total,
+    rate_limited_requests_total,
+    rate_limit_errors_total,
+]
+
+
+def render_metrics() -> bytes:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    return Response(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def timed(histogram: Histogram, name: str) -> Callable[[Callable], Callable]:
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start, name)
+
+        return wrapper
+
+    return decorator
+
+
+def time_module_functions(namespace: dict[str, Any], module: str) -> None:
+    """
+    Замер времени всех публичных функций модуля (crud_call_duration_seconds)
+
+    Функции заменяются в пространстве имен модуля, поэтому замеряются и вызовы
+    через crud.<функция>, и вызовы внутри самого модуля
+    """
+    for name, func in list(namespace.items()):
+        if (
+            callable(func)
+            and getattr(func, "__module__", None) == module
+            and not name.startswith("_")
+            and not isinstance(func, type)
+        ):
+            namespace[name] = timed(crud_call_duration_seconds, name)(func)
+
+
+class MetricsMiddleware:
+    """
+    Количество запросов по маршрутам и кодам ответа и гистограмма времени обработки
+
+    Маршрут берется из шаблона пути (/api/vacancy/{vacancy_id}), а не из самого пути,
+    чтобы количество рядов не росло с количеством id. Метрики хранятся в памяти
+    процесса, при нескольких воркерах каждый отдает свои.
+    """
+
+    def __init__(self, app: ASGIApp, exclude: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.exclude = exclude
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            http_request_duration_seconds.observe(
+                time.perf_counter() - start, method, path
+            )
+            http_requests_total.inc(method, path, str(status_code))
@@ -0,0 +1,151 @@
+import cProfile
+import hashlib
+import hmac
+import io
+import os
+import pstats
+import random
+import re
+import secrets
+import time
+from dataclasses import dataclass
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.logging import log
+from app.utils.settings import settings
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # pyinstrument is optional, cProfile is used without it
+    Profiler = None
+
+PROFILE_HEADER = "x-profile"
+PROFILE_FORMAT_HEADER = "x-profile-format"
+
+_unsafe = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+def profile_signature(path: str, expires: int | None = None) -> str:
+    """
+    Значение заголовка X-Profile: "<expires>.<HMAC пути и expires на SECRET_KEY>"
+
+    Подпись действует до expires (unix time), по умолчанию PROFILING_SIGNATURE_TTL секунд
+    """
+    if expires is None:
+        expires = int(time.time()) + settings.PROFILING_SIGNATURE_TTL
+    digest = hmac.new(
+        settings.SECRET_KEY.encode(), f"{expires}:{path}".encode(), hashlib.sha256
+    ).hexdigest()
+    return f"{expires}.{digest}"
+
+
+def verify_profile_signature(value: str, path: str) -> bool:
+    expires, _, _ = value.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(value, profile_signature(path, int(expires)))
+
+
+@dataclass
+class ProfileReport:
+    name: str
+    size: int
+    created: float
+
+
+def list_reports() -> list[ProfileReport]:
+    """Сохраненные отчеты, новые первыми"""
+    if not os.path.isdir(settings.PROFILING_DIR):
+        return []
+    reports = []
+    for entry in os.scandir(settings.PROFILING_DIR):
+        if entry.is_file():
+            stat = entry.stat()
+            reports.append(ProfileReport(entry.name, stat.st_size, stat.st_mtime))
+    return sorted(reports, key=lambda report: report.created, reverse=True)
+
+
+def report_path(name: str) -> str | None:
+    """Путь к отчету по имени, только для файлов из каталога отчетов"""
+    if name not in {report.name for report in list_reports()}:
+        return None
+    return os.path.join(settings.PROFILING_DIR, name)
+
+
+def save_report(name: str, content: str) -> None:
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    with open(os.path.join(settings.PROFILING_DIR, name), "w", encoding="utf-8") as f:
+        f.write(content)
+    # the oldest reports are removed to keep the directory capped
+    for report in list_reports()[settings.PROFILING_MAX_REPORTS :]:
+        os.remove(os.path.join(settings.PROFILING_DIR, report.name))
+
+
+class ProfilingMiddleware:
+    """
+    Профилирование отдельных запросов в продакшене
+
+    Профилируются запросы с заголовком X-Profile, равным неистекшей
+    profile_signature(path), и случайная доля PROFILING_SAMPLE_RATE остальных запросов. С pyinstrument
+    отчет сохраняется в HTML или speedscope JSON (заголовок X-Profile-Format),
+    без него - текстовая статистика cProfile (только поток обработчика).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    def _should_profile(self, scope: Scope) -> bool:
+        signature = Headers(scope=scope).get(PROFILE_HEADER)
+        if signature:
+            return verify_profile_signature(signature, scope["path"])
+        return random.random() < settings.PROFILING_SAMPLE_RATE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        report_format = Headers(scope=scope).get(PROFILE_FORMAT_HEADER, "html")
+        start = time.perf_counter()
+        if Profiler is not None:
+            profiler = Profiler(async_mode="enabled")
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            duration = time.perf_counter() - start
+            if Profiler is not None:
+                profiler.stop()
+                if report_format == "speedscope":
+                    extension = "speedscope.json"
+                    content = profiler.output(SpeedscopeRenderer())
+                else:
+                    extension = "html"
+                    content = profiler.output_html()
+            else:
+                profiler.disable()
+                extension = "txt"
+                stream = io.StringIO()
+                pstats.Stats(profiler, stream=stream).sort_stats(
+                    "cumulative"
+                ).print_stats(100)
+                content = stream.getvalue()
+
+            route = getattr(scope.get("route"), "path", scope["path"])
+            name = "{}-{}_{}_{}_{}ms.{}".format(
+                time.strftime("%Y%m%d-%H%M%S"),
+                secrets.token_hex(3),
+                scope["method"],
+                _unsafe.sub("_", route).strip("_"),
+                round(duration * 1000),
+                extension,
+            )
+            await run_in_threadpool(save_report, name, content)
+            log.info("request profile saved: %s", name)
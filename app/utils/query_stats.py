@@ -0,0 +1,89 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.logging import log
+from app.utils.settings import settings
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    # суммарное время выполнения запросов в секундах
+    duration: float = 0
+    # количество выполнений каждого текста запроса (параметры в тексте не подставлены)
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count > threshold
+        ]
+
+
+# статистика запросов текущего HTTP запроса, заполняется хуками движка в database.py
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+class QueryStatsMiddleware:
+    """
+    Количество и время SQL запросов на HTTP запрос
+
+    Запросы, в которых один и тот же SQL выполнился больше N_PLUS_ONE_THRESHOLD раз
+    (обычно ленивая загрузка связей в цикле), попадают в лог. При SQL_DEBUG
+    количество и время добавляются в заголовки ответа X-DB-Query-Count и X-DB-Query-Time.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.SQL_DEBUG:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(stats.count)
+                headers["X-DB-Query-Time"] = f"{stats.duration * 1000:.1f}"
+                repeated = stats.repeated(settings.N_PLUS_ONE_THRESHOLD)
+                if repeated:
+                    headers["X-DB-N-Plus-One"] = str(repeated[0][1])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            route = getattr(scope.get("route"), "path", scope["path"])
+            for statement, count in stats.repeated(settings.N_PLUS_ONE_THRESHOLD):
+                log.warning(
+                    "possible N+1 in %s %s: statement executed %s times: %s",
+                    scope["method"],
+                    route,
+                    count,
+                    " ".join(statement.split())[:300],
+                )
+            log.debug(
+                "%s %s: %s queries, %.1f ms",
+                scope["method"],
+                route,
+                stats.count,
+                stats.duration * 1000,
+            )
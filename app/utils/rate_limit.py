@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+
+from app.utils.logging import log
+from app.utils.metrics import rate_limit_errors_total
+from app.utils.settings import settings
+
+
+class MemoryBuckets:
+    """
+    Корзины токенов в памяти процесса, у каждого воркера свои
+
+    Корзины, к которым давно не обращались, вытесняются (вытесненная корзина
+    считается полной, поэтому лимит лишь ослабевает)
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                tokens, wait = tokens - 1, 0.0
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+# refill, take one token and return the wait time in one atomic step;
+# the bucket expires once it would be full again
+TAKE_SCRIPT = """
+local rate, burst, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated")
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil((burst - tokens) / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RedisBuckets:
+    """
+    Корзины токенов в Redis, общие для всех воркеров
+
+    При ошибке соединения запрос пропускается, следующие CACHE_REDIS_RETRY секунд
+    запросы пропускаются без обращения к redis
+    """
+
+    def __init__(self, url: str):
+        import redis  # optional dependency, only needed with RATE_LIMIT_BACKEND=redis
+
+        self._errors = (redis.RedisError, OSError)
+        client = redis.Redis.from_url(
+            url, socket_timeout=0.5, socket_connect_timeout=0.5
+        )
+        self._take = client.register_script(TAKE_SCRIPT)
+        self._retry_at = 0.0
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        if time.monotonic() < self._retry_at:
+            return 0.0
+        try:
+            return float(
+                self._take(
+                    keys=[f"{settings.CACHE_PREFIX}:rate_limit:{key}"],
+                    args=[rate, burst, time.time()],
+                )
+            )
+        except self._errors as e:
+            self._retry_at = time.monotonic() + settings.CACHE_REDIS_RETRY
+            rate_limit_errors_total.inc("redis")
+            log.warning("redis rate limit failed: %s", e)
+            return 0.0
+
+
+_buckets: MemoryBuckets | RedisBuckets | None = None
+_buckets_lock = threading.Lock()
+
+
+def get_buckets() -> MemoryBuckets | RedisBuckets:
+    """Хранилище корзин по RATE_LIMIT_BACKEND, создается при первом обращении"""
+    global _buckets
+    with _buckets_lock:
+        if _buckets is None:
+            if settings.RATE_LIMIT_BACKEND == "redis":
+                _buckets = RedisBuckets(settings.CACHE_REDIS_URL)
+            else:
+                _buckets = MemoryBuckets(settings.RATE_LIMIT_MEMORY_SIZE)
+        return _buckets
+
+
+def take(key: str, rate: float, burst: int) -> float:
+    """
+    Взять токен из корзины key (пополняется на rate токенов в секунду до burst)
+
+    Возвращает 0, если токен взят, иначе время в секундах до появления токена
+    """
+    return get_buckets().take(key, rate, burst)
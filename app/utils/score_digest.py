@@ -0,0 +1,28 @@
+import hashlib
+
+from app.data import schemas
+
+
+def _digest(*values) -> str:
+    return hashlib.blake2b(repr(values).encode(), digest_size=16).hexdigest()
+
+
+def row_digest(
+    student: schemas.StudentTrackInfo, events: list[schemas.EventCreate]
+) -> str:
+    """Хеш строки студента: курс и оценки по каждому мероприятию"""
+    return _digest(
+        student.course,
+        tuple(zip((event.title for event in events), student.scores)),
+    )
+
+
+def column_digest(
+    index: int, event: schemas.EventCreate, students: list[schemas.StudentTrackInfo]
+) -> str:
+    """Хеш колонки мероприятия: дата, максимальный балл и оценки всех студентов"""
+    return _digest(
+        event.start_date.isoformat(),
+        event.max_score,
+        tuple((student.fio, student.scores[index]) for student in students),
+    )
@@ -1,9 +1,87 @@
-import json
+from functools import lru_cache
+from typing import Any, Iterable
+
+import orjson
 import pydantic.json
+from fastapi import status
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_SINGLETON
+from pydantic.utils import lenient_issubclass
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.dict()
+    return pydantic.json.pydantic_encoder(obj)
 
 
-def _custom_json_serializer(*args, **kwargs) -> str:
+def dumps(obj: Any) -> bytes:
+    """
+    Encodes json with orjson, types unknown to orjson are encoded in the same way that pydantic does.
+    """
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _custom_json_serializer(obj: Any) -> str:
     """
     Encodes json in the same way that pydantic does.
     """
-    return json.dumps(*args, default=pydantic.json.pydantic_encoder, **kwargs)
+    return dumps(obj).decode()
+
+
+class JSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache
+def _orm_fields(schema: type[BaseModel]) -> list[tuple[str, Any, type | None, bool]]:
+    fields = []
+    for name, field in schema.__fields__.items():
+        nested = None
+        if (
+            lenient_issubclass(field.type_, BaseModel)
+            and field.type_.__config__.orm_mode
+        ):
+            nested = field.type_
+        fields.append((name, field.default, nested, field.shape == SHAPE_SINGLETON))
+    return fields
+
+
+def orm_to_dict(schema: type[BaseModel], obj: Any) -> dict[str, Any]:
+    """
+    Чтение полей схемы из ORM объекта без валидации pydantic
+
+    Вложенные orm_mode схемы (например теги вакансии) читаются рекурсивно,
+    остальные значения (в том числе JSON колонки) отдаются как есть
+    """
+    data = {}
+    for name, default, nested, singleton in _orm_fields(schema):
+        value = getattr(obj, name, default)
+        if nested is not None and value is not None:
+            if singleton:
+                value = orm_to_dict(nested, value)
+            else:
+                value = [orm_to_dict(nested, i) for i in value]
+        data[name] = value
+    return data
+
+
+def orm_list_response(
+    schema: type[BaseModel],
+    rows: Iterable[Any] | None,
+    status_code: int = status.HTTP_200_OK,
+) -> Response:
+    """
+    Ответ со списком ORM объектов, сериализованных напрямую в байты
+
+    Возвращается готовый Response, поэтому FastAPI не валидирует его повторно по response_model.
+    Пустой список отдается как null, как и в остальных списочных эндпоинтах.
+    """
+    content = [orm_to_dict(schema, row) for row in rows] if rows else None
+    return Response(
+        content=dumps(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
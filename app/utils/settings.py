@@ -1,3 +1,4 @@
+import re
 from typing import Any, Dict, List, Optional, Union
 from os import path
 
@@ -65,6 +66,140 @@ class Settings(BaseSettings):
     SERVICE_MAIL_HOST: str = "smtp.mail.ru"
     SERVICE_MAIL_PORT: int = 587
 
+    # сервер: в режиме PRODUCTION запускается SERVER_WORKERS процессов (0 - по числу ядер)
+    # с uvloop и httptools без перезагрузки, при остановке текущие запросы
+    # завершаются не дольше SERVER_GRACEFUL_TIMEOUT секунд.
+    # Состояние в памяти у каждого воркера свое: /metrics отдает счетчики одного
+    # воркера (при сборе через балансировщик ряды скачут), снимки /memory и отчеты
+    # /profiling видны только в создавшем их воркере, поэтому по умолчанию воркер один
+    PRODUCTION: bool = False
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 9999
+    SERVER_WORKERS: int = 1
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    SERVER_KEEP_ALIVE: int = 5
+    # адреса прокси (через запятую, * - любые), которым доверяются X-Forwarded-For
+    # и X-Forwarded-Proto: без этого адресом клиента считается адрес прокси
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+
+    # запись логов в файл (по умолчанию кроме PRODUCTION: несколько процессов, включая
+    # пулы выгрузки и импорта, не могут ротировать один файл, в docker логи пишутся
+    # в stdout и ротируются docker), максимальный размер файла в байтах и количество старых
+    LOG_TO_FILE: Optional[bool] = None
+    LOG_FILE_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_FILE_BACKUP_COUNT: int = 5
+
+    @validator("LOG_TO_FILE", pre=True, always=True)
+    def assemble_log_to_file(cls, v: Optional[bool], values: Dict[str, Any]) -> bool:
+        if v is None or v == "":
+            return not values.get("PRODUCTION")
+        return v
+
+    # сжатие ответов: минимальный размер тела в байтах, уровень gzip (1-9) и brotli (0-11)
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # кэш списков вакансий: количество ответов и время жизни в секундах
+    VACANCY_CACHE_SIZE: int = 1024
+    VACANCY_CACHE_TTL: int = 300
+
+    # общий кэш: memory (свой у каждого воркера) или redis (общий), адрес redis, сколько
+    # секунд после ошибки redis не используется (кэш и ограничение частоты работают
+    # без него, не дожидаясь таймаута соединения в каждом запросе), префикс ключей,
+    # размер кэша в памяти, сколько секунд отдается устаревшее значение при пересчете
+    # и сколько секунд остальные вызовы ждут значение, которое вычисляет один из них
+    CACHE_BACKEND: str = "memory"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_REDIS_RETRY: float = 5
+    CACHE_PREFIX: str = "backend"
+    CACHE_MEMORY_SIZE: int = 10_000
+    CACHE_STALE_TTL: float = 30
+    CACHE_LOCK_TIMEOUT: float = 10
+    # время жизни в кэше текущего пользователя и доступных фильтров вакансий, с
+    USER_CACHE_TTL: float = 60
+    FILTERS_CACHE_TTL: float = 300
+
+    @validator("CACHE_BACKEND")
+    def check_cache_backend(cls, v: str) -> str:
+        if v not in ("memory", "redis"):
+            raise ValueError("CACHE_BACKEND must be memory or redis")
+        return v
+
+    # сброс кэшей во всех воркерах по NOTIFY из crud: включение, канал postgres
+    # и пауза перед переподключением слушателя в секундах
+    CACHE_INVALIDATION_ENABLED: bool = True
+    CACHE_INVALIDATION_CHANNEL: str = "cache_invalidation"
+    CACHE_INVALIDATION_RETRY: float = 5
+
+    @validator("CACHE_INVALIDATION_CHANNEL")
+    def check_invalidation_channel(cls, v: str) -> str:
+        # the channel is used as an identifier in LISTEN, it can't be a bind parameter
+        if not re.fullmatch(r"[a-z_][a-z0-9_]*", v):
+            raise ValueError(
+                "CACHE_INVALIDATION_CHANNEL must be a lowercase identifier"
+            )
+        return v
+
+    # ограничение частоты тяжелых запросов (token bucket по пользователю или ip): memory
+    # (у каждого воркера свои корзины) или redis (CACHE_REDIS_URL, общие), количество
+    # корзин в памяти; для эндпоинтов - пополнение в запросах в секунду и размер корзины.
+    # ip клиента берется из X-Forwarded-For только от SERVER_FORWARDED_ALLOW_IPS, иначе
+    # за прокси все анонимные запросы (вход, регистрация) попадают в одну корзину
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_MEMORY_SIZE: int = 100_000
+    RATE_LIMIT_LOGIN_RATE: float = 0.5
+    RATE_LIMIT_LOGIN_BURST: int = 10
+    RATE_LIMIT_SIGNUP_RATE: float = 0.1
+    RATE_LIMIT_SIGNUP_BURST: int = 5
+    RATE_LIMIT_SCORE_UPLOAD_RATE: float = 1 / 30
+    RATE_LIMIT_SCORE_UPLOAD_BURST: int = 2
+    RATE_LIMIT_MAILING_RATE: float = 1 / 60
+    RATE_LIMIT_MAILING_BURST: int = 2
+
+    @validator("RATE_LIMIT_BACKEND")
+    def check_rate_limit_backend(cls, v: str) -> str:
+        if v not in ("memory", "redis"):
+            raise ValueError("RATE_LIMIT_BACKEND must be memory or redis")
+        return v
+
+    # SQL: порог медленного запроса в мс, количество повторов одного запроса
+    # за HTTP запрос для предупреждения об N+1, EXPLAIN медленных запросов и заголовки X-DB-*
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    N_PLUS_ONE_THRESHOLD: int = 10
+    SQL_DEBUG: bool = False
+
+    # профилирование запросов: доля случайных запросов, каталог и количество отчетов,
+    # время действия подписи для заголовка X-Profile в секундах
+    PROFILING_SAMPLE_RATE: float = 0
+    PROFILING_DIR: Optional[str] = None
+    PROFILING_MAX_REPORTS: int = 100
+    PROFILING_SIGNATURE_TTL: int = 300
+
+    @validator("PROFILING_DIR", pre=True, always=True)
+    def assemble_profiling_dir(cls, v: Optional[str], values: Dict[str, Any]) -> str:
+        if isinstance(v, str):
+            return v
+        return "/data/profiles" if values.get("DOCKER_MODE") else "profiles"
+
+    # tracemalloc: включение при старте, глубина стека аллокаций и количество снимков
+    MEMORY_TRACING: bool = False
+    MEMORY_TRACE_FRAMES: int = 1
+    MEMORY_MAX_SNAPSHOTS: int = 5
+
+    # выгрузка данных: количество строк, читаемых из курсора за раз
+    EXPORT_BATCH_SIZE: int = 1000
+    # количество процессов для формирования xlsx выгрузок
+    EXPORT_XLSX_WORKERS: int = 1
+
+    # импорт пользователей: количество процессов для хеширования паролей и строк в файле
+    USER_IMPORT_WORKERS: int = 2
+    USER_IMPORT_MAX_ROWS: int = 10_000
+
+    # минимальная похожесть ФИО (по триграммам) для сопоставления студентов при загрузке оценок
+    FIO_SIMILARITY_THRESHOLD: float = 0.7
+
     class Config:
         case_sensitive = True
         env_file = ".env"
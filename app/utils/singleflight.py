@@ -0,0 +1,39 @@
+import asyncio
+from typing import Any, Callable, Hashable
+
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.metrics import singleflight_calls_total
+
+
+class SingleFlight:
+    """
+    Объединение одновременных одинаковых вычислений в процессе
+
+    Первый вызов с ключом запускает функцию в пуле потоков (не блокируя event loop),
+    вызовы с тем же ключом до ее завершения ждут и получают тот же результат
+    или то же исключение. Отмена ожидающего запроса не прерывает вычисление, поэтому
+    функция не должна использовать объекты запроса (например, его сессию БД).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(run_in_threadpool(fn, *args))
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._done(key, done))
+            singleflight_calls_total.inc(self.name, "executed")
+        else:
+            singleflight_calls_total.inc(self.name, "coalesced")
+        return await asyncio.shield(future)
+
+    def _done(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # mark the exception as retrieved when every waiter was cancelled
+            future.exception()
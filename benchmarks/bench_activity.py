@@ -0,0 +1,39 @@
+from app.data import crud
+from app.data.constants import UserRole
+from app.service import track_service
+
+
+def bench_get_events(measure):
+    measure(crud.get_events, 100, 0)
+
+
+def bench_get_events_scores(measure, users):
+    measure(crud.get_events_scores, users[UserRole.candidate], 100, 0)
+
+
+def bench_refresh_candidate_score_totals(measure):
+    measure(crud.refresh_candidate_score_totals)
+
+
+def bench_get_candidates_scores(measure):
+    measure(crud.get_candidates_scores, 100, 0)
+
+
+def bench_get_candidates_top(measure):
+    measure(crud.get_candidates_top, 100)
+
+
+def bench_get_candidates_score_histogram(measure):
+    measure(crud.get_candidates_score_histogram, 20)
+
+
+def bench_get_candidate_score_by_id(measure, users):
+    measure(crud.get_candidate_score_by_id, users[UserRole.candidate].id)
+
+
+def bench_get_all_events_scores(measure):
+    measure(crud.get_all_events_scores)
+
+
+def bench_evaluate_tracks(measure):
+    measure(track_service.evaluate_tracks)
@@ -0,0 +1,14 @@
+import pytest
+
+from app.data import crud
+from app.data.constants import InternApplicationParameters, InternApplicationStatus
+
+
+@pytest.mark.parametrize("status", [None, InternApplicationStatus.approved])
+def bench_get_all_intern_applications(measure, status):
+    measure(crud.get_all_intern_applications, 0, 100, status)
+
+
+@pytest.mark.parametrize("param", list(InternApplicationParameters))
+def bench_get_intern_application_stats(measure, param):
+    measure(crud.get_intern_application_stats, param)
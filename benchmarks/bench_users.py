@@ -0,0 +1,26 @@
+from app.data import crud
+from app.data.constants import UserRole
+
+
+def bench_get_user_by_email(measure, users):
+    measure(crud.get_user_by_email, users[UserRole.candidate].email)
+
+
+def bench_get_users(measure):
+    measure(crud.get_users, 0, 100)
+
+
+def bench_get_all_feedbacks(measure):
+    measure(crud.get_all_feedbacks, 0, 100)
+
+
+def bench_get_user_received_feedbacks(measure, users):
+    measure(crud.get_user_received_feedbacks, users[UserRole.candidate], 100, 0)
+
+
+def bench_get_sent_mailings(measure, users):
+    measure(crud.get_sent_mailings, users[UserRole.curator], 100, 0)
+
+
+def bench_get_recieved_mailings(measure, users):
+    measure(crud.get_recieved_mailings, users[UserRole.candidate], 100, 0)
@@ -0,0 +1,67 @@
+import pytest
+
+from app.data import crud, schemas
+from app.data.constants import UserRole
+from app.service import vacancy_service
+
+FILTERS = {
+    "empty": schemas.VacancyFilters(),
+    "tags": schemas.VacancyFilters(tags=["Тег 1", "Тег 2", "Тег 3"]),
+    "full": schemas.VacancyFilters(
+        tags=["Тег 1"],
+        organisations=["Департамент транспорта"],
+        city="Москва",
+    ),
+}
+
+
+@pytest.mark.parametrize("role", [UserRole.candidate, UserRole.hr, UserRole.curator])
+@pytest.mark.parametrize("filters", FILTERS)
+def bench_get_vacancies(measure, users, role, filters):
+    db_user = users[role]
+    measure(
+        crud.get_vacancies,
+        db_user,
+        FILTERS[filters],
+        0,
+        100,
+        vacancy_service.get_vacancies_status(db_user.role),
+    )
+
+
+def bench_get_vacancies_serialized(measure, users):
+    # query plus orm_to_dict of the tags relationship, as returned by POST /vacancy/
+    vacancy_service.invalidate_vacancies_cache()
+
+    def call(db):
+        vacancy_service.invalidate_vacancies_cache()
+        return vacancy_service.get_vacancies_response(
+            db, users[UserRole.candidate], FILTERS["empty"], 0, 100
+        )
+
+    measure(call)
+
+
+def bench_get_all_tags(measure):
+    measure(crud.get_all_tags)
+
+
+def bench_get_all_cities(measure):
+    measure(crud.get_all_cities)
+
+
+def bench_get_all_organisations(measure):
+    measure(crud.get_all_organisations)
+
+
+def bench_build_filters(measure):
+    measure(vacancy_service.build_filters)
+
+
+@pytest.mark.parametrize("role", [UserRole.mentor, UserRole.hr])
+def bench_get_offers(measure, users, role):
+    measure(crud.get_offers, users[role], 100, 0)
+
+
+def bench_get_users_available_mentors(measure):
+    measure(crud.get_users_available_mentors, 0, 100)
@@ -0,0 +1,91 @@
+"""
+Бенчмарк сжатия ответов: затраты CPU против сэкономленных байт
+
+Payload'ы строятся так же, как их отдают эндпоинты (orm_list_response):
+список вакансий /vacancy/ (limit=100), заявки /intern_application/all (limit=100)
+и ответ /mailing/send/school_invite на 5000 получателей. С --url и --cookie
+можно дополнительно замерить тело ответа запущенного приложения.
+
+Запуск из корня репозитория (нужен заполненный .env):
+    python -m benchmarks.compression
+    python -m benchmarks.compression --url http://localhost:9999/api/vacancy/filters --cookie <access_token>
+"""
+
+import argparse
+import datetime
+import time
+
+import httpx
+
+from app.data import models, schemas
+from app.data.constants import MailingSubjects
+from app.utils.compression import Compressor, brotli
+from app.utils.serializer import orm_list_response
+from benchmarks.serialization import make_intern_applications, make_vacancies
+
+REPEAT = 20
+LEVELS = [("gzip", 1), ("gzip", 6), ("gzip", 9)]
+if brotli is not None:
+    LEVELS += [("br", 1), ("br", 4), ("br", 11)]
+
+
+def make_mailings(n: int) -> list[models.Mailing]:
+    return [
+        models.Mailing(
+            id=i,
+            sender_id=1,
+            target_id=i,
+            time_sent=datetime.datetime(2023, 6, 15, 12, 0, i % 60),
+            subject=MailingSubjects.school_invite.value,
+        )
+        for i in range(n)
+    ]
+
+
+def measure(name: str, body: bytes) -> None:
+    print(f"{name}: {len(body) / 1024:.1f} KiB")
+    for encoding, level in LEVELS:
+        started = time.perf_counter()
+        for _ in range(REPEAT):
+            compressed = Compressor(encoding, level, level).finish(body)
+        elapsed = (time.perf_counter() - started) / REPEAT * 1000
+        print(
+            f"  {encoding:<4} level {level:<2} {len(compressed) / 1024:8.1f} KiB "
+            f"({len(compressed) / len(body):6.1%})  {elapsed:7.2f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url")
+    parser.add_argument("--cookie", help="access_token cookie value")
+    parser.add_argument("--method", default="GET")
+    args = parser.parse_args()
+
+    measure(
+        "/vacancy/ limit=100",
+        orm_list_response(schemas.VacancyDto, make_vacancies(100)).body,
+    )
+    measure(
+        "/intern_application/all limit=100",
+        orm_list_response(
+            schemas.InternApplication, make_intern_applications(100)
+        ).body,
+    )
+    measure(
+        "/mailing/send/school_invite 5000 recipients",
+        orm_list_response(schemas.Mailing, make_mailings(5000)).body,
+    )
+    if args.url:
+        response = httpx.request(
+            args.method,
+            args.url,
+            cookies={"access_token": args.cookie} if args.cookie else None,
+            headers={"Accept-Encoding": "identity"},
+            json={} if args.method == "POST" else None,
+        )
+        measure(args.url, response.content)
+
+
+if __name__ == "__main__":
+    main()
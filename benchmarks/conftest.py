@@ -0,0 +1,95 @@
+"""
+Общие фикстуры бенчмарков crud
+
+База: BENCH_DATABASE_URI (без нее бенчмарки пропускаются). Пустая база заполняется
+benchmarks.seed при первом запуске, --reseed пересоздает данные с --bench-scale.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import func, inspect, select
+from sqlalchemy.orm import Session
+
+from app.data import models
+from app.data.constants import UserRole
+from benchmarks.seed import bench_engine, seed_database
+
+
+def pytest_addoption(parser):
+    parser.addoption("--reseed", action="store_true", help="пересоздать данные")
+    parser.addoption("--bench-scale", type=float, default=1, help="объем данных")
+
+
+@pytest.fixture(scope="session")
+def engine(request):
+    if not os.environ.get("BENCH_DATABASE_URI"):
+        pytest.skip("BENCH_DATABASE_URI is not set")
+    engine = bench_engine()
+    seeded = inspect(engine).has_table(models.User.__tablename__)
+    if seeded:
+        with Session(engine) as db:
+            seeded = db.scalar(select(func.count(models.User.id))) > 0
+    if request.config.getoption("--reseed") or not seeded:
+        seed_database(engine, request.config.getoption("--bench-scale"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    with Session(engine) as db:
+        yield db
+        db.rollback()
+
+
+@pytest.fixture
+def users(db) -> dict[UserRole, models.User]:
+    """Пользователь каждой роли с наибольшим количеством связанных данных"""
+    hr_id = db.scalar(
+        select(models.Vacancy.hr_id)
+        .group_by(models.Vacancy.hr_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    mentor_id = db.scalar(
+        select(models.MentorVacancyOffer.mentor_id)
+        .group_by(models.MentorVacancyOffer.mentor_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    candidate_id = db.scalar(
+        select(models.Mailing.target_id)
+        .group_by(models.Mailing.target_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    curator_id = db.scalar(
+        select(models.Mailing.sender_id)
+        .group_by(models.Mailing.sender_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    return {
+        UserRole.hr: db.get(models.User, hr_id),
+        UserRole.mentor: db.get(models.User, mentor_id),
+        UserRole.candidate: db.get(models.User, candidate_id),
+        UserRole.curator: db.get(models.User, curator_id),
+    }
+
+
+@pytest.fixture
+def measure(benchmark, db):
+    """
+    Замер функции crud(db, *args): перед каждым вызовом объекты сессии сбрасываются,
+    чтобы ленивые загрузки связей выполнялись каждый раз, как в отдельном запросе
+    """
+
+    def run(func, *args, **kwargs):
+        def call():
+            db.expire_all()
+            return func(db, *args, **kwargs)
+
+        return benchmark(call)
+
+    return run
@@ -0,0 +1,119 @@
+"""
+Отчет о времени импорта приложения (python -X importtime)
+
+Импортирует модуль (по умолчанию main, как воркер uvicorn) в отдельном процессе
+несколько раз, берет самый быстрый запуск и печатает общее время импорта, RSS процесса
+после импорта, время по пакетам верхнего уровня и самые медленные модули.
+Завершается с ошибкой, если при старте загружен один из тяжелых пакетов,
+которые должны импортироваться при первом использовании (--lazy).
+
+Запуск из корня репозитория (нужен заполненный .env):
+    python -m benchmarks.import_time --runs 5 --top 20 --json import_time.json
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+import orjson
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# пакеты, которые нужны только отдельным эндпоинтам
+LAZY_MODULES = ["pandas", "numpy", "openpyxl"]
+
+_line = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+_probe = """
+import resource, sys
+import {module}
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+print(" ".join(sorted(sys.modules)))
+"""
+
+
+def measure(module: str) -> dict:
+    """Один импорт в новом процессе: времена модулей в мкс, RSS в КиБ, загруженные модули"""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _probe.format(module=module)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in process.stderr.splitlines():
+        match = _line.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            depth = (len(indent) - 1) // 2
+            modules.append((name, int(self_us), int(cumulative_us), depth))
+    rss, loaded = process.stdout.strip().splitlines()[-2:]
+    total = next(cumulative for name, _, cumulative, _ in modules if name == module)
+    return {
+        "total_us": total,
+        "rss_kib": int(rss),
+        "modules": modules,
+        "loaded": set(loaded.split()),
+    }
+
+
+def report(result: dict, top: int) -> dict:
+    packages: dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in result["modules"]:
+        packages[name.split(".")[0]] += self_us
+    packages_top = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    modules_top = sorted(result["modules"], key=lambda item: item[1], reverse=True)
+
+    print(f"import time: {result['total_us'] / 1000:.1f} ms")
+    print(f"max RSS:     {result['rss_kib'] / 1024:.1f} MiB")
+    print(f"modules:     {len(result['modules'])}")
+    print(f"\n{'package':<40} {'self ms':>9}")
+    for name, self_us in packages_top[:top]:
+        print(f"{name:<40} {self_us / 1000:>9.1f}")
+    print(f"\n{'module':<60} {'self ms':>9} {'cumul ms':>9}")
+    for name, self_us, cumulative_us, _ in modules_top[:top]:
+        print(f"{name:<60} {self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}")
+
+    return {
+        "total_ms": result["total_us"] / 1000,
+        "rss_mib": result["rss_kib"] / 1024,
+        "modules": len(result["modules"]),
+        "packages": {name: self_us / 1000 for name, self_us in packages_top[:top]},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument(
+        "--lazy",
+        nargs="*",
+        default=LAZY_MODULES,
+        help="пакеты, которые не должны загружаться при импорте",
+    )
+    parser.add_argument("--json", help="файл для сохранения отчета")
+    args = parser.parse_args()
+
+    # the first run warms up the bytecode cache, the fastest run is reported
+    results = [measure(args.module) for _ in range(args.runs)]
+    result = min(results, key=lambda result: result["total_us"])
+    summary = report(result, args.top)
+
+    eager = sorted(set(args.lazy) & result["loaded"])
+    if args.json:
+        with open(args.json, "wb") as f:
+            f.write(
+                orjson.dumps(summary | {"eager": eager}, option=orjson.OPT_INDENT_2)
+            )
+    if eager:
+        sys.exit(f"\nloaded at import: {', '.join(eager)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Нагрузочный тест приложения с реалистичной смесью ролей
+
+Виртуальные пользователи входят через /api/users/login под пользователями из
+benchmarks.seed (candidate1@bench.example.com, ..., пароль BENCH_PASSWORD) и в течение
+--duration секунд выполняют взвешенную смесь запросов своей роли. В конце печатаются
+пропускная способность, коды ответов и p50/p95/p99 по каждому маршруту.
+
+Запуск из корня репозитория (приложение запущено на базе, заполненной benchmarks.seed).
+Все виртуальные пользователи входят с одного ip, поэтому ограничение частоты входа
+нужно отключить (иначе вход растягивается на минуты из-за ответов 429):
+    python -m benchmarks.seed --scale 1
+    RATE_LIMIT_ENABLED=false uvicorn main:app --port 8000
+    python -m benchmarks.load_test --base-url http://localhost:8000 --duration 60 \\
+        --candidates 200 --mentors 20 --hr 10 --curators 5 --json load.json
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+import httpx
+import orjson
+
+from app.data.constants import InternApplicationParameters, UserRole
+from benchmarks.seed import BENCH_PASSWORD, bench_email
+
+
+@dataclass
+class Route:
+    name: str
+    method: str
+    path: str
+    weight: int
+    params: dict | None = None
+    json: dict | None = None
+
+
+def _stats(parameter: InternApplicationParameters) -> Route:
+    return Route(
+        f"GET /intern_application/stats?parameters={parameter.value}",
+        "GET",
+        "/api/intern_application/stats",
+        3,
+        params={"parameters": parameter.value},
+    )
+
+
+ROUTES: dict[UserRole, list[Route]] = {
+    UserRole.candidate: [
+        Route("POST /vacancy/ (empty)", "POST", "/api/vacancy/", 30, json={}),
+        Route(
+            "POST /vacancy/ (tags)",
+            "POST",
+            "/api/vacancy/",
+            15,
+            json={"tags": ["Тег 1", "Тег 2"], "city": "Москва"},
+        ),
+        Route("GET /vacancy/filters", "GET", "/api/vacancy/filters", 20),
+        Route("GET /intern_application/my", "GET", "/api/intern_application/my", 10),
+        Route("GET /activity/scores", "GET", "/api/activity/scores", 10),
+        Route("GET /activity/events", "GET", "/api/activity/events", 10),
+        Route("GET /activity/tracks/my", "GET", "/api/activity/tracks/my", 5),
+        Route("GET /users/", "GET", "/api/users/", 10),
+        Route("GET /feedback/received", "GET", "/api/feedback/received", 5),
+    ],
+    UserRole.mentor: [
+        Route("GET /vacancy/mentor/offers", "GET", "/api/vacancy/mentor/offers", 20),
+        Route("POST /vacancy/ (empty)", "POST", "/api/vacancy/", 20, json={}),
+        Route("GET /feedback/sent", "GET", "/api/feedback/sent", 10),
+        Route("GET /users/", "GET", "/api/users/", 10),
+    ],
+    UserRole.hr: [
+        Route("POST /vacancy/ (empty)", "POST", "/api/vacancy/", 20, json={}),
+        Route("GET /vacancy/mentors", "GET", "/api/vacancy/mentors", 15),
+        Route("GET /vacancy/mentor/offers", "GET", "/api/vacancy/mentor/offers", 15),
+        Route("GET /vacancy/filters", "GET", "/api/vacancy/filters", 10),
+    ],
+    UserRole.curator: [
+        Route(
+            "GET /intern_application/all",
+            "GET",
+            "/api/intern_application/all",
+            20,
+            params={"limit": 100},
+        ),
+        *(_stats(parameter) for parameter in InternApplicationParameters),
+        Route(
+            "GET /activity/candidates/all",
+            "GET",
+            "/api/activity/candidates/all",
+            15,
+            params={"limit": 100},
+        ),
+        Route(
+            "GET /activity/candidates/top", "GET", "/api/activity/candidates/top", 10
+        ),
+        Route("GET /activity/tracks/results", "GET", "/api/activity/tracks/results", 5),
+    ],
+}
+
+
+@dataclass
+class Results:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+
+    def record(self, name: str, status: int | str, latency: float) -> None:
+        self.latencies[name].append(latency)
+        self.statuses[name][status] += 1
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    index = min(int(round(q / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    while True:
+        response = await client.post(
+            "/api/users/login", json={"email": email, "password": password}
+        )
+        if response.status_code != 429:
+            break
+        # the login rate limit is enabled on the server, wait for a token
+        await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+    response.raise_for_status()
+    # the cookie is secure, so it is sent explicitly instead of through the cookie jar
+    return response.cookies["access_token"]
+
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    role: UserRole,
+    token: str,
+    deadline: float,
+    think_time: float,
+    results: Results,
+    rnd: random.Random,
+) -> None:
+    routes = ROUTES[role]
+    weights = [route.weight for route in routes]
+    headers = {"Cookie": f"access_token={token}"}
+    while time.perf_counter() < deadline:
+        route = rnd.choices(routes, weights)[0]
+        start = time.perf_counter()
+        try:
+            response = await client.request(
+                route.method,
+                route.path,
+                params=route.params,
+                json=route.json,
+                headers=headers,
+            )
+            status: int | str = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        results.record(route.name, status, time.perf_counter() - start)
+        if think_time:
+            await asyncio.sleep(rnd.expovariate(1 / think_time))
+
+
+def report(results: Results, elapsed: float) -> list[dict]:
+    rows = []
+    for name in sorted(results.latencies):
+        latencies = results.latencies[name]
+        errors = sum(
+            count
+            for status, count in results.statuses[name].items()
+            if not isinstance(status, int) or status >= 500
+        )
+        rows.append(
+            {
+                "route": name,
+                "requests": len(latencies),
+                "rps": len(latencies) / elapsed,
+                "errors": errors,
+                "statuses": {str(k): v for k, v in results.statuses[name].items()},
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p95_ms": percentile(latencies, 95) * 1000,
+                "p99_ms": percentile(latencies, 99) * 1000,
+            }
+        )
+
+    print(
+        f"{'route':<52} {'req':>7} {'rps':>8} {'err':>5} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  statuses"
+    )
+    for row in rows:
+        statuses = " ".join(f"{k}:{v}" for k, v in sorted(row["statuses"].items()))
+        print(
+            f"{row['route']:<52} {row['requests']:>7} {row['rps']:>8.1f} "
+            f"{row['errors']:>5} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+            f"{row['p99_ms']:>8.1f}  {statuses}"
+        )
+    all_latencies = [i for values in results.latencies.values() for i in values]
+    if all_latencies:
+        print(
+            f"{'total':<52} {len(all_latencies):>7} "
+            f"{len(all_latencies) / elapsed:>8.1f} "
+            f"{sum(row['errors'] for row in rows):>5} "
+            f"{percentile(all_latencies, 50) * 1000:>8.1f} "
+            f"{percentile(all_latencies, 95) * 1000:>8.1f} "
+            f"{percentile(all_latencies, 99) * 1000:>8.1f}"
+        )
+    return rows
+
+
+async def run(args: argparse.Namespace) -> None:
+    counts = {
+        UserRole.candidate: args.candidates,
+        UserRole.mentor: args.mentors,
+        UserRole.hr: args.hr,
+        UserRole.curator: args.curators,
+    }
+    limits = httpx.Limits(max_connections=args.connections)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        # logins are done before the measured phase, bcrypt would dominate it otherwise
+        semaphore = asyncio.Semaphore(args.connections)
+
+        async def user_token(role: UserRole, index: int) -> tuple[UserRole, str]:
+            async with semaphore:
+                return role, await login(
+                    client, bench_email(role, index), args.password
+                )
+
+        start = time.perf_counter()
+        tokens = await asyncio.gather(
+            *(
+                user_token(role, index)
+                for role, count in counts.items()
+                for index in range(1, count + 1)
+            )
+        )
+        print(f"logged in {len(tokens)} users in {time.perf_counter() - start:.1f} s")
+
+        results = Results()
+        rnd = random.Random(args.seed)
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(
+            *(
+                virtual_user(
+                    client,
+                    role,
+                    token,
+                    deadline,
+                    args.think_time,
+                    results,
+                    random.Random(rnd.random()),
+                )
+                for role, token in tokens
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+    rows = report(results, elapsed)
+    if args.json:
+        with open(args.json, "wb") as f:
+            f.write(
+                orjson.dumps(
+                    {"duration": elapsed, "users": len(tokens), "routes": rows},
+                    option=orjson.OPT_INDENT_2,
+                )
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=60, help="секунды")
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--mentors", type=int, default=20)
+    parser.add_argument("--hr", type=int, default=10)
+    parser.add_argument("--curators", type=int, default=5)
+    parser.add_argument(
+        "--think-time", type=float, default=0, help="средняя пауза между запросами, с"
+    )
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--password", default=BENCH_PASSWORD)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="файл для сохранения результатов")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
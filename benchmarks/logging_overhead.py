@@ -0,0 +1,96 @@
+"""
+Микро-бенчмарк накладных расходов логирования на пути /vacancy/
+
+1. Форматирование при выключенном DEBUG: crud.get_vacancies логирует фильтры, статусы
+   и список из 100 вакансий. f-строка строит repr всех строк до проверки уровня,
+   %-аргументы форматируются только если запись будет выведена.
+2. Запись в вызывающем потоке при включенном уровне: синхронные FileHandler и
+   StreamHandler против QueueHandler, запись в файл и консоль делает поток QueueListener.
+
+Запуск из корня репозитория (нужен заполненный .env):
+    python -m benchmarks.logging_overhead
+"""
+
+import logging
+import os
+import queue
+import tempfile
+import timeit
+from logging.handlers import QueueHandler, QueueListener
+
+from app.data import schemas
+from app.utils.logging import formatter
+from benchmarks.serialization import make_vacancies
+
+LIMIT = 100
+REPEAT = 2000
+
+
+def make_logger(name: str, level: int, *handlers: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers = list(handlers)
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def vacancies_eager(logger, data, status, rows):
+    logger.debug(f"filters: {data}")
+    logger.debug(f"status: {status}")
+    logger.debug(f"vacancies: {rows}")
+
+
+def vacancies_lazy(logger, data, status, rows):
+    logger.debug("filters: %s", data)
+    logger.debug("status: %s", status)
+    logger.debug("vacancies: %s", rows)
+
+
+def measure(func, repeat: int = REPEAT) -> float:
+    return min(timeit.repeat(func, number=repeat, repeat=3)) / repeat * 1000
+
+
+def main():
+    rows = make_vacancies(LIMIT)
+    data = schemas.VacancyFilters(tags=["Python"], city="Москва").dict()
+    status = ["published"]
+
+    logger = make_logger("benchmark.format", logging.INFO, logging.NullHandler())
+    eager = measure(lambda: vacancies_eager(logger, data, status, rows), 200)
+    lazy = measure(lambda: vacancies_lazy(logger, data, status, rows), 200)
+    print(
+        f"{'/vacancy/ debug, level INFO':<32} f-string: {eager:8.4f} ms  "
+        f"%-args: {lazy:8.4f} ms  x{eager / lazy:.0f}"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+
+        def handlers():
+            fh = logging.FileHandler(os.path.join(tmp, "backend.log"))
+            ch = logging.StreamHandler(devnull)
+            for handler in (fh, ch):
+                handler.setFormatter(formatter)
+            return fh, ch
+
+        sync_handlers = handlers()
+        logger = make_logger("benchmark.sync", logging.INFO, *sync_handlers)
+        sync = measure(lambda: logger.info("vacancies: %s", status))
+
+        log_queue = queue.SimpleQueue()
+        queue_handlers = handlers()
+        listener = QueueListener(log_queue, *queue_handlers)
+        listener.start()
+        logger = make_logger("benchmark.queue", logging.INFO, QueueHandler(log_queue))
+        queued = measure(lambda: logger.info("vacancies: %s", status))
+        listener.stop()
+
+        for handler in (*sync_handlers, *queue_handlers):
+            handler.close()
+    print(
+        f"{'log.info in request thread':<32} sync I/O: {sync:8.4f} ms  "
+        f"queue:  {queued:8.4f} ms  x{sync / queued:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
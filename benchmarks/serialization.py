@@ -0,0 +1,114 @@
+"""
+Микро-бенчмарк сериализации списочных ответов (limit=100)
+
+Сравнивает прежний путь (from_orm для каждой строки, повторная валидация по response_model
+и json.dumps в FastAPI) с orm_list_response (чтение полей без валидации и orjson)
+для ответов /vacancy/ и /intern_application/all. База данных не нужна: строки - это
+несохраненные ORM объекты.
+
+Запуск из корня репозитория (нужен заполненный .env):
+    python -m benchmarks.serialization
+"""
+
+import asyncio
+import datetime
+import timeit
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.data import models, schemas
+from app.utils.serializer import orm_list_response
+
+LIMIT = 100
+REPEAT = 200
+
+
+def make_vacancies(n: int) -> list[models.Vacancy]:
+    tags = [models.Tag(id=i, name=f"Тег {i}") for i in range(5)]
+    return [
+        models.Vacancy(
+            id=i,
+            title=f"Стажер-аналитик {i}",
+            description="Описание вакансии " * 40,
+            hr_id=1,
+            mentor_id=2,
+            start_date=datetime.datetime(2023, 6, 15),
+            end_date=datetime.datetime(2023, 9, 15),
+            test="https://127.0.0.1/test",
+            requirements={
+                "citizenship": ["RU", "BY", "KZ"],
+                "age": 35,
+                "experience": "1 год",
+                "education_level": {"Бакалавриат": 3, "Специалитет": 4},
+                "specializations": ["01.03.02", "01.03.03"],
+            },
+            organisation="Департамент информационных технологий",
+            coordinates="55.728291, 37.609463",
+            address="Москва,Ленинский проспект,4",
+            status="published",
+            tags=tags[: i % 5 + 1],
+        )
+        for i in range(n)
+    ]
+
+
+def make_intern_applications(n: int) -> list[models.InternApplication]:
+    return [
+        models.InternApplication(
+            id=i,
+            course="Прикладная математика",
+            education="НИТУ МИСиС",
+            resume="Резюме кандидата " * 20,
+            citizenship="RU",
+            graduation_date=datetime.date(2024, 6, 30),
+            status="verified",
+            city="Москва",
+        )
+        for i in range(n)
+    ]
+
+
+def old_path(schema, field, rows) -> bytes:
+    content = [schema.from_orm(row) for row in rows] if rows else None
+    value = asyncio.run(serialize_response(field=field, response_content=content))
+    return JSONResponse(value).body
+
+
+def main():
+    for name, schema, rows in (
+        ("/vacancy/", schemas.VacancyDto, make_vacancies(LIMIT)),
+        (
+            "/intern_application/all",
+            schemas.InternApplication,
+            make_intern_applications(LIMIT),
+        ),
+    ):
+        field = create_response_field(name="response", type_=list[schema] | None)
+        # asyncio.run overhead is excluded from the old path timing
+        loop_overhead = min(
+            timeit.repeat(
+                lambda: asyncio.run(asyncio.sleep(0)), number=REPEAT, repeat=3
+            )
+        )
+        old = min(
+            timeit.repeat(
+                lambda: old_path(schema, field, rows), number=REPEAT, repeat=3
+            )
+        )
+        new = min(
+            timeit.repeat(
+                lambda: orm_list_response(schema, rows).body, number=REPEAT, repeat=3
+            )
+        )
+        old = (old - loop_overhead) / REPEAT * 1000
+        new = new / REPEAT * 1000
+        print(
+            f"{name:<26} from_orm+response_model: {old:7.3f} ms  "
+            f"orm_list_response: {new:7.3f} ms  x{old / new:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
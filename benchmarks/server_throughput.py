@@ -0,0 +1,121 @@
+"""
+Сравнение пропускной способности режимов запуска сервера
+
+Для каждой конфигурации uvicorn (dev: asyncio + h11, один процесс; prod: uvloop +
+httptools, --workers процессов) приложение запускается в отдельном процессе, после
+чего --concurrency клиентов в течение --duration секунд запрашивают --path.
+Печатаются rps и p50/p99 задержки по каждой конфигурации.
+
+Запуск из корня репозитория (нужен заполненный .env и доступные БД и почтовый сервер,
+к ним приложение подключается при старте):
+    python -m benchmarks.server_throughput --workers 4 --duration 20 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.load_test import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFIGS = {
+    "dev": ["--loop", "asyncio", "--http", "h11", "--workers", "1"],
+    "prod": ["--loop", "uvloop", "--http", "httptools"],
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_ready(base_url: str, path: str, timeout: float = 60) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.perf_counter() < deadline:
+            try:
+                await client.get(path)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise TimeoutError(f"server at {base_url} did not start")
+
+
+async def drive(base_url: str, path: str, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] = (
+                    statuses.get(response.status_code, 0) + 1
+                )
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "statuses": statuses,
+    }
+
+
+def run_config(name: str, args: argparse.Namespace) -> dict:
+    port = free_port()
+    command = [sys.executable, "-m", "uvicorn", args.app, "--port", str(port)]
+    command += CONFIGS[name] + ["--no-access-log"]
+    if name == "prod":
+        command += ["--workers", str(args.workers)]
+    server = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(wait_ready(base_url, args.path))
+        # warm up every worker before measuring
+        asyncio.run(drive(base_url, args.path, args.concurrency, 2))
+        return asyncio.run(drive(base_url, args.path, args.concurrency, args.duration))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--app", default="main:app")
+    parser.add_argument("--path", default="/docs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--configs", nargs="*", default=list(CONFIGS))
+    args = parser.parse_args()
+
+    print(
+        f"{'config':<8} {'requests':>9} {'rps':>9} {'p50 ms':>8} {'p99 ms':>8}  statuses"
+    )
+    for name in args.configs:
+        result = run_config(name, args)
+        print(
+            f"{name:<8} {result['requests']:>9} {result['rps']:>9.1f} "
+            f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f}  {result['statuses']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
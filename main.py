@@ -1,15 +1,42 @@
+import os
+
+from app.data import models
+from app.data.database import engine
 from app.loader import create_app
 from app.utils.settings import settings
 import uvicorn
 
 app = create_app()
 
-if __name__ == "__main__":
+
+def run_production():
+    # tables are created once before the workers start, concurrent create_all races
+    models.Base.metadata.create_all(bind=engine)
     uvicorn.run(
         "main:app",
-        reload=True,
-        use_colors=True,
-        host="0.0.0.0",
-        port=9999,
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=settings.SERVER_WORKERS or os.cpu_count(),
+        loop="uvloop",
+        http="httptools",
         proxy_headers=True,
+        forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        access_log=False,
     )
+
+
+if __name__ == "__main__":
+    if settings.PRODUCTION:
+        run_production()
+    else:
+        uvicorn.run(
+            "main:app",
+            reload=True,
+            use_colors=True,
+            host=settings.SERVER_HOST,
+            port=settings.SERVER_PORT,
+            proxy_headers=True,
+            forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+        )